@@ -9,33 +9,42 @@ from stepper_hat_pigpio import controller  # or: from stepper_hat_pigpio import
 # sudo apt update && sudo apt install -y python3-pigpio pigpio
 # sudo systemctl enable --now pigpiod
 
-def sweep_pan():
-    print("[pan] centre → +45 → -45 → 0")
-    controller.pan(0);   time.sleep(0.3)
-    controller.pan(45);  time.sleep(0.8)
-    controller.pan(-45); time.sleep(0.8)
-    controller.pan(0);   time.sleep(0.6)
-
-def sweep_tilt():
-    print("[tilt] centre → +30 → -30 → 0")
-    controller.tilt(0);   time.sleep(0.3)
-    controller.tilt(30);  time.sleep(0.6)
-    controller.tilt(-30); time.sleep(0.6)
-    controller.tilt(0);   time.sleep(0.5)
-
-def both_together():
-    print("[both] opposite directions")
-    controller.pan(35)
-    controller.tilt(-35)
-    time.sleep(0.8)
-    controller.pan(0)
-    controller.tilt(0)
-    time.sleep(0.6)
+# The whole demo as one timeline: (seconds from start, pan deg, tilt deg).
+# None leaves that axis on its previous setpoint. The pan and tilt sweeps
+# drive independent motors, so they run over the same window.
+TRAJECTORY = [
+    # [pan] centre → +45 → -45 → 0, [tilt] centre → +30 → -30 → 0
+    (0.0, 0, 0),
+    (0.3, 45, 30),
+    (0.9, None, -30),
+    (1.1, -45, None),
+    (1.5, None, 0),
+    (1.9, 0, None),
+    # [both] opposite directions
+    (2.5, 35, -35),
+    (3.3, 0, 0),
+]
+TRAJECTORY_END_S = 3.9
+
+
+def _sleep_until(deadline):
+    remaining = deadline - time.monotonic()
+    if remaining > 0:
+        time.sleep(remaining)
+
+
+def play(trajectory, end_s):
+    # Setpoints are scheduled against one start time, so per-call latency
+    # doesn't accumulate the way chained sleeps do
+    t0 = time.monotonic()
+    for t, pan, tilt in trajectory:
+        _sleep_until(t0 + t)
+        controller.move(pan, tilt)
+    _sleep_until(t0 + end_s)
 
 if __name__ == "__main__":
     # do a few quiet sweeps
-    sweep_pan()
-    sweep_tilt()
-    both_together()
+    print("[pan] + [tilt] sweeps together, then [both] opposite directions")
+    play(TRAJECTORY, TRAJECTORY_END_S)
 
     print("done.")
@@ -39,13 +39,196 @@ import math
 import os
 import sys
 import time
+import threading
 import asyncio
+import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 
 from quart import Quart, jsonify, render_template, Response, request
 from stepper_hat import controller_gpio
 
+# simplejpeg wraps libjpeg-turbo directly and returns bytes, skipping OpenCV's
+# generic encoder and the extra ndarray -> bytes copy; cv2 is the fallback
+try:
+    import simplejpeg
+    _HAS_SIMPLEJPEG = True
+except ImportError:
+    _HAS_SIMPLEJPEG = False
+
+# orjson serializes straight to bytes and is several times faster than
+# json.dumps, for both the SSE messages and jsonify(); stdlib json is the fallback
+try:
+    import orjson
+    from quart.json.provider import DefaultJSONProvider
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
+# Stream JPEG quality; the stream is usually limited by Wi-Fi bandwidth, so
+# these trade a little quality for much smaller frames. Override per machine
+# with the JPEG_QUALITY / JPEG_QUALITY_LOW env vars.
+JPEG_QUALITY = int(os.getenv("JPEG_QUALITY", "60"))
+JPEG_QUALITY_LOW = int(os.getenv("JPEG_QUALITY_LOW", "40"))  # Used when struggling to keep up
+
+# Frames wider than this are scaled down before encoding; a browser view
+# rarely needs more, and encode time and bytes scale with the pixel count
+STREAM_MAX_WIDTH = 640
+
+# cv2 fallback: baseline (non-progressive), no optimize pass, 4:2:0 chroma
+_CV2_JPEG_FLAGS = [cv2.IMWRITE_JPEG_OPTIMIZE, 0, cv2.IMWRITE_JPEG_PROGRESSIVE, 0]
+if hasattr(cv2, 'IMWRITE_JPEG_SAMPLING_FACTOR'):  # OpenCV >= 4.5.5
+    _CV2_JPEG_FLAGS += [cv2.IMWRITE_JPEG_SAMPLING_FACTOR, cv2.IMWRITE_JPEG_SAMPLING_FACTOR_420]
+
+def encode_jpeg(frame, quality):
+    """
+    JPEG-encode a BGR or single-channel grayscale frame.
+
+    Returns:
+        bytes or None: The encoded frame, or None if encoding failed
+    """
+    if _HAS_SIMPLEJPEG:
+        if frame.ndim == 2:
+            return simplejpeg.encode_jpeg(np.ascontiguousarray(frame)[:, :, np.newaxis], quality=quality,
+                                          colorspace='GRAY', fastdct=True)
+        return simplejpeg.encode_jpeg(np.ascontiguousarray(frame), quality=quality,
+                                      colorspace='BGR', colorsubsampling='420', fastdct=True)
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality] + _CV2_JPEG_FLAGS)
+    return buffer.tobytes() if ret else None
+
+# Server-Sent Events framing around each JSON payload
+SSE_PREFIX = b'data: '
+SSE_SUFFIX = b'\n\n'
+
+def sse_event(payload):
+    """Encode a dict as one SSE message, already as bytes."""
+    if _HAS_ORJSON:
+        return SSE_PREFIX + orjson.dumps(payload) + SSE_SUFFIX
+    return SSE_PREFIX + json.dumps(payload).encode() + SSE_SUFFIX
+
+# MJPEG multipart framing
+FRAME_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+FRAME_TRAILER = b'\r\n'
+
+# Errors the video stream recovers from by sending the fallback frame. Anything
+# else is a bug and ends the stream rather than being retried forever, and
+# cancellation on client disconnect propagates without a fallback yield.
+STREAM_ERRORS = (cv2.error, OSError, RuntimeError, ValueError)
+
+def _make_fallback_chunk():
+    """Black 640x480 frame shown when the camera is unavailable, as a multipart chunk."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    cv2.putText(frame, "Camera Unavailable", (120, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    return FRAME_HEADER + cv2.imencode('.jpg', frame)[1].tobytes() + FRAME_TRAILER
+
+def _make_heartbeat_chunk():
+    """Tiny black frame sent to keep the connection alive, as a multipart chunk."""
+    frame = np.zeros((8, 8, 3), dtype=np.uint8)
+    return FRAME_HEADER + cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 30])[1].tobytes() + FRAME_TRAILER
+
+# Built once at import instead of on every /video_feed request
+FALLBACK_CHUNK = _make_fallback_chunk()
+HEARTBEAT_CHUNK = _make_heartbeat_chunk()
+
+# Stream frames are resized and encoded here rather than on the event loop,
+# so other endpoints keep responding while a frame is encoded
+ENCODER_POOL = ThreadPoolExecutor(max_workers=2)
+
+def encode_stream_frame(frame, quality, gray=False):
+    """Scale a frame down to the stream size if needed and JPEG-encode it, optionally as grayscale."""
+    # Scale down if the driver ignored the requested frame size
+    h, w = frame.shape[:2]
+    if w > STREAM_MAX_WIDTH:
+        scale = STREAM_MAX_WIDTH / w
+        frame = cv2.resize(frame, (STREAM_MAX_WIDTH, int(h * scale)), interpolation=cv2.INTER_AREA)
+    if gray:
+        # One luma plane and no chroma to transform
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    return encode_jpeg(frame, quality)
+
+# cv2.VideoCapture isn't thread-safe. Every viewer's capture task reads the
+# shared camera from a worker thread, and handlers release or query it too, so
+# each of those calls holds CAMERA_LOCK. A read can hold it for as long as the
+# driver blocks, so the event loop never takes it: handlers go through
+# camera_call(), which waits for it in a worker thread.
+CAMERA_LOCK = threading.Lock()
+
+def _locked_camera_call(func, *args):
+    with CAMERA_LOCK:
+        return func(*args)
+
+async def camera_call(func, *args):
+    """Runs func(*args) (e.g. camera.read) under CAMERA_LOCK in a worker thread."""
+    return await asyncio.to_thread(_locked_camera_call, func, *args)
+
+def grab_latest_frame(cam, max_drain, frame_period):
+    """
+    Drain the frames queued since the last read and decode only the newest.
+
+    grab() doesn't decode; a grab that has to wait for the camera means the
+    queue is empty.
+
+    Returns:
+        tuple: (success, frame, number of frames grabbed)
+    """
+    grabbed = 0
+    for _ in range(max_drain):
+        grab_start = time.perf_counter()
+        if not cam.grab():
+            break
+        grabbed += 1
+        if time.perf_counter() - grab_start > frame_period / 2:
+            break
+    if not grabbed:
+        return False, None, 0
+    success, frame = cam.retrieve()
+    return success, frame, grabbed
+
+def capture_latest_frame(cam, interval):
+    """
+    grab_latest_frame() under CAMERA_LOCK, draining at most the frames that
+    arrive in one stream interval. Runs in a worker thread.
+
+    Returns:
+        tuple or None: grab_latest_frame()'s result, or None if cam is None or closed
+    """
+    if cam is None:
+        return None
+    with CAMERA_LOCK:
+        # Checked under the lock: another viewer may have released cam since
+        if not cam.isOpened():
+            return None
+        frame_period = 1.0 / (cam.get(cv2.CAP_PROP_FPS) or 30.0)
+        max_drain = max(1, min(4, int(interval / frame_period)))
+        return grab_latest_frame(cam, max_drain, frame_period)
+
+# Per-frame and per-update messages go through this logger rather than print(),
+# so they cost nothing below the configured level (LOG_LEVEL env var, default
+# INFO; per-frame messages are DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger(__name__)
+
+class _RateLimitFilter(logging.Filter):
+    """Drops repeats of the same message logged within `interval` seconds."""
+
+    def __init__(self, interval=5.0):
+        super().__init__()
+        self.interval = interval
+        self._last = {}
+
+    def filter(self, record):
+        now = time.monotonic()
+        key = (record.levelno, record.msg)
+        if now - self._last.get(key, -self.interval) < self.interval:
+            return False
+        self._last[key] = now
+        return True
+
+# A camera that keeps failing would otherwise log the same lines on every frame
+logger.addFilter(_RateLimitFilter())
+
 # Initialize the webcam variable, but don't open it yet
 # We'll open it in the setup function to ensure proper initialization
 camera = None
@@ -146,6 +329,16 @@ def initialize_camera(attempt=1, last_error=None):
 
         # Check if the camera was opened successfully
         if cam.isOpened():
+            # Keep at most one frame queued in the driver so reads aren't stale
+            cam.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            # Ask the driver for stream-sized frames so they needn't be resized
+            native_width = cam.get(cv2.CAP_PROP_FRAME_WIDTH)
+            if native_width > STREAM_MAX_WIDTH:
+                scale = STREAM_MAX_WIDTH / native_width
+                cam.set(cv2.CAP_PROP_FRAME_WIDTH, STREAM_MAX_WIDTH)
+                cam.set(cv2.CAP_PROP_FRAME_HEIGHT, round(cam.get(cv2.CAP_PROP_FRAME_HEIGHT) * scale))
+
             # Get and print camera properties for debugging
             width = cam.get(cv2.CAP_PROP_FRAME_WIDTH)
             height = cam.get(cv2.CAP_PROP_FRAME_HEIGHT)
@@ -235,7 +428,25 @@ def get_available_cameras(max_to_check=10):
 
     return available_cameras
 
+if _HAS_ORJSON:
+    class OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            # Hand orjson's bytes straight to the response, without the
+            # bytes -> str -> bytes round trip the default provider makes
+            obj = self._prepare_response_obj(args, kwargs)
+            body = orjson.dumps(obj, default=self.default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+            return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Quart(__name__)
+if _HAS_ORJSON:
+    app.json = OrjsonProvider(app)
 
 @app.route('/')
 async def index():
@@ -277,12 +488,12 @@ async def control():
 
             # Two decimal places is quite enough!
             angle = round(a, 2)
-            print(angle)
+            logger.debug("angle %s", angle)
 
             # Send an update every 100 iterations
             count += 1
             if count >= 100:
-                yield f"data: {{\"angle\": {angle}}}\n\n"
+                yield sse_event({"angle": angle})
                 count = 0
 
             # Sleep for a bit so we're not hammering the HAT with updates
@@ -301,8 +512,8 @@ async def reset(duration=10):
     Resets the pan and tilt positions to 0 and maintains the position.
 
     This endpoint sets both the pan and tilt angles to 0, which is the center position.
-    The position is maintained by continuously sending signals to the servos for the specified
-    duration (in seconds).
+    The position is set once and held for the specified duration (in seconds), with an
+    update sent every 0.5 seconds.
 
     Args:
         duration (int, optional): How long to maintain the position in seconds. Defaults to 10.
@@ -318,26 +529,19 @@ async def reset(duration=10):
         return jsonify({"status": "Pan and tilt reset to 0 (one-time)"})
 
     async def generate():
-        count = 0
+        # The axes hold their position, so it only needs sending once
+        controller_gpio.pan(0)
+        controller_gpio.tilt(0)
+
         start_time = time.time()
         end_time = start_time + duration
 
         while time.time() < end_time:
-            # Continuously send the reset position commands
-            controller_gpio.pan(0)
-            controller_gpio.tilt(0)
-
-            # Send an update every 100 iterations
-            count += 1
-            if count >= 100:
-                yield f"data: {{\"pan\": 0, \"tilt\": 0, \"remaining\": {round(end_time - time.time(), 1)}}}\n\n"
-                count = 0
-
-            # Sleep for a bit so we're not hammering the HAT with updates
-            await asyncio.sleep(0.005)
+            await asyncio.sleep(min(0.5, end_time - time.time()))
+            yield sse_event({"pan": 0, "tilt": 0, "remaining": round(max(0, end_time - time.time()), 1)})
 
         # Send a final update
-        yield f"data: {{\"pan\": 0, \"tilt\": 0, \"remaining\": 0, \"status\": \"complete\"}}\n\n"
+        yield sse_event({"pan": 0, "tilt": 0, "remaining": 0, "status": "complete"})
 
     return app.response_class(
         generate(),
@@ -353,8 +557,8 @@ async def set_position(pan, tilt, duration=10):
 
     This endpoint allows manual control of the pan and tilt mechanism by setting
     specific angles for both axes. Values are clamped to the valid range of -90 to 90 degrees.
-    The position is maintained by continuously sending signals to the servos for the specified
-    duration (in seconds).
+    The position is set once and held for the specified duration (in seconds), with an
+    update sent every 0.5 seconds.
 
     Args:
         pan (int): The pan angle in degrees (-90 to 90).
@@ -383,26 +587,19 @@ async def set_position(pan, tilt, duration=10):
         })
 
     async def generate():
-        count = 0
+        # The axes hold their position, so it only needs sending once
+        controller_gpio.pan(pan)
+        controller_gpio.tilt(tilt)
+
         start_time = time.time()
         end_time = start_time + duration
 
         while time.time() < end_time:
-            # Continuously send the same position commands to maintain the position
-            controller_gpio.pan(pan)
-            controller_gpio.tilt(tilt)
-
-            # Send an update every 100 iterations
-            count += 1
-            if count >= 100:
-                yield f"data: {{\"pan\": {pan}, \"tilt\": {tilt}, \"remaining\": {round(end_time - time.time(), 1)}}}\n\n"
-                count = 0
-
-            # Sleep for a bit so we're not hammering the HAT with updates
-            await asyncio.sleep(0.005)
+            await asyncio.sleep(min(0.5, end_time - time.time()))
+            yield sse_event({"pan": pan, "tilt": tilt, "remaining": round(max(0, end_time - time.time()), 1)})
 
         # Send a final update
-        yield f"data: {{\"pan\": {pan}, \"tilt\": {tilt}, \"remaining\": 0, \"status\": \"complete\"}}\n\n"
+        yield sse_event({"pan": pan, "tilt": tilt, "remaining": 0, "status": "complete"})
 
     return app.response_class(
         generate(),
@@ -424,6 +621,23 @@ async def position_control():
     """
     return await render_template('position_control.html')
 
+def _read_diagnostics(cam):
+    """Reads the diagnostic properties and one test frame from cam; call under CAMERA_LOCK."""
+    properties = {
+        "width": cam.get(cv2.CAP_PROP_FRAME_WIDTH),
+        "height": cam.get(cv2.CAP_PROP_FRAME_HEIGHT),
+        "fps": cam.get(cv2.CAP_PROP_FPS),
+        "brightness": cam.get(cv2.CAP_PROP_BRIGHTNESS),
+        "contrast": cam.get(cv2.CAP_PROP_CONTRAST),
+        "saturation": cam.get(cv2.CAP_PROP_SATURATION),
+        "hue": cam.get(cv2.CAP_PROP_HUE),
+        "gain": cam.get(cv2.CAP_PROP_GAIN),
+        "exposure": cam.get(cv2.CAP_PROP_EXPOSURE),
+        "backend": cam.getBackendName()
+    }
+    success, _ = cam.read()
+    return properties, success
+
 @app.route('/camera_diagnostics')
 async def camera_diagnostics():
     """
@@ -450,27 +664,15 @@ async def camera_diagnostics():
     camera_properties = {}
     last_frame_status = "Unknown"
 
-    if camera is not None:
-        if camera.isOpened():
+    cam = camera
+    if cam is not None:
+        if await camera_call(cam.isOpened):
             camera_status = "Initialized and opened"
 
-            # Get camera properties
-            properties = {
-                "width": camera.get(cv2.CAP_PROP_FRAME_WIDTH),
-                "height": camera.get(cv2.CAP_PROP_FRAME_HEIGHT),
-                "fps": camera.get(cv2.CAP_PROP_FPS),
-                "brightness": camera.get(cv2.CAP_PROP_BRIGHTNESS),
-                "contrast": camera.get(cv2.CAP_PROP_CONTRAST),
-                "saturation": camera.get(cv2.CAP_PROP_SATURATION),
-                "hue": camera.get(cv2.CAP_PROP_HUE),
-                "gain": camera.get(cv2.CAP_PROP_GAIN),
-                "exposure": camera.get(cv2.CAP_PROP_EXPOSURE),
-                "backend": camera.getBackendName()
-            }
-            camera_properties = {k: float(v) for k, v in properties.items() if v is not None}
-
-            # Try to read a test frame
-            success, _ = camera.read()
+            # Get camera properties and read a test frame
+            # Returned as read, like main.py: float() would fail on the backend name
+            camera_properties, success = await camera_call(_read_diagnostics, cam)
+
             if success:
                 last_frame_status = "Success"
             else:
@@ -592,7 +794,7 @@ async def reset_camera():
     if camera is not None:
         try:
             print("Forcibly releasing camera...")
-            camera.release()
+            await camera_call(camera.release)
         except Exception as e:
             print(f"Error releasing camera: {e}")
 
@@ -606,9 +808,9 @@ async def reset_camera():
     print("Forcibly reinitializing camera...")
     camera = initialize_camera()
 
-    if camera is not None and camera.isOpened():
+    if camera is not None and await camera_call(camera.isOpened):
         # Try to read a test frame
-        success, _ = camera.read()
+        success, _ = await camera_call(camera.read)
         if success:
             return jsonify({
                 "status": "success",
@@ -632,22 +834,15 @@ async def video_feed():
 
     This endpoint returns a multipart response with JPEG frames from the webcam.
     The video stream can be embedded in HTML img tags or used as a background.
+    With ?mode=gray the frames are sent as grayscale JPEGs, which are smaller
+    and quicker to encode, and are all the ArUco calibration needs.
 
     Returns:
         Response: A streaming response with JPEG frames from the webcam.
     """
     global camera
 
-    # Create a fallback frame for when camera is unavailable
-    fallback_frame = np.zeros((480, 640, 3), dtype=np.uint8)  # Black frame
-    cv2.putText(fallback_frame, "Camera Unavailable", (120, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-    _, fallback_buffer = cv2.imencode('.jpg', fallback_frame)
-    fallback_bytes = fallback_buffer.tobytes()
-
-    # Create a heartbeat frame to keep the connection alive
-    heartbeat_frame = np.zeros((8, 8, 3), dtype=np.uint8)  # Tiny black frame for heartbeat
-    _, heartbeat_buffer = cv2.imencode('.jpg', heartbeat_frame, [cv2.IMWRITE_JPEG_QUALITY, 30])
-    heartbeat_bytes = heartbeat_buffer.tobytes()
+    gray = request.args.get('mode') == 'gray'
 
     # Configuration parameters
     MAX_FAILURES = 5  # Maximum consecutive failures before resetting camera
@@ -660,6 +855,7 @@ async def video_feed():
     last_frame_time = 0
     last_heartbeat_time = 0
     current_interval = MIN_FRAME_INTERVAL
+    dropped_frames = 0
 
     # Check if camera is None (not initialized) and try to initialize it
     if camera is None:
@@ -671,186 +867,236 @@ async def video_feed():
             # We'll continue with the fallback frame
 
     async def generate():
-        nonlocal consecutive_failures, last_frame_time, last_heartbeat_time, current_interval
+        nonlocal consecutive_failures, last_frame_time, last_heartbeat_time, current_interval, dropped_frames
         global camera
 
+        # The next frame is captured in a separate task, in a worker thread,
+        # while the current one is encoded and sent. Each capture starts so it
+        # finishes about when its frame is due (next_due, less the time the
+        # last capture took), and is stamped so one that still waited more
+        # than an interval in the slot is dropped instead of sent.
+        frames = asyncio.Queue(maxsize=1)
+        next_due = time.monotonic() + current_interval
+        capture_time = 0.0
+
+        async def capture_loop():
+            nonlocal capture_time
+            while True:
+                delay = next_due - capture_time - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                started = time.monotonic()
+                try:
+                    # Reads block for up to a frame period, so they run in a worker thread
+                    result = await asyncio.to_thread(capture_latest_frame, camera, current_interval)
+                except STREAM_ERRORS as e:
+                    result = e
+                captured_at = time.monotonic()
+                capture_time = min(captured_at - started, MAX_FRAME_INTERVAL)
+                await frames.put((captured_at, result))
+                # Start the next capture only once this one has been taken
+                await frames.join()
+
+        capture_task = asyncio.create_task(capture_loop())
+
         # Set initial timestamps
         last_frame_time = time.time()
         last_heartbeat_time = time.time()
 
-        while True:
-            try:
-                current_time = time.time()
-
-                # Check if it's time to send a heartbeat to keep the connection alive
-                if current_time - last_heartbeat_time >= HEARTBEAT_INTERVAL:
-                    print(f"Sending heartbeat to keep connection alive")
-                    last_heartbeat_time = current_time
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + heartbeat_bytes + b'\r\n')
-
-                # Check if enough time has passed to send a new frame
-                if current_time - last_frame_time < current_interval:
-                    # Not time for a new frame yet, sleep a bit and continue
-                    await asyncio.sleep(0.01)  # Short sleep to prevent CPU spinning
-                    continue
-
-                # Update last frame time
-                last_frame_time = current_time
-
-                # Check if camera is None or not opened
-                if camera is None or not camera.isOpened():
-                    print(f"Camera not available, attempting to initialize/reopen...")
-
-                    # If camera exists, try to release it first
-                    if camera is not None:
-                        try:
-                            camera.release()
-                        except Exception as e:
-                            print(f"Error releasing camera: {e}")
-
-                    # Set camera to None to ensure clean state
-                    camera = None
-
-                    # Wait before reopening
-                    await asyncio.sleep(1)
-
-                    # Try to initialize/reopen the camera using the robust initialization function
-                    print("Attempting to reinitialize camera...")
-                    camera = initialize_camera()
-
-                    if camera is not None and camera.isOpened():
-                        print("Successfully reinitialized camera")
-                        # Reset failure counter on successful initialization
-                        consecutive_failures = 0
-                        # Reset frame interval to default
-                        current_interval = MIN_FRAME_INTERVAL
-                    else:
-                        print("Failed to reinitialize camera using all available methods")
-                        camera = None
-
-                    # Use fallback frame regardless of initialization result
-                    # This ensures the stream continues even if camera init failed
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
-                    continue
-
-                # Try to read a frame with timeout protection
-                frame = None
-                success = False
-
+        try:
+            while True:
                 try:
-                    # Read frame from camera
-                    success, frame = camera.read()
+                    current_time = time.time()
+
+                    # Check if it's time to send a heartbeat to keep the connection alive
+                    if current_time - last_heartbeat_time >= HEARTBEAT_INTERVAL:
+                        logger.debug("Sending heartbeat to keep connection alive")
+                        last_heartbeat_time = current_time
+                        yield HEARTBEAT_CHUNK
+
+                    # Check if enough time has passed to send a new frame
+                    if current_time - last_frame_time < current_interval:
+                        # Not time for a new frame yet, sleep a bit and continue
+                        await asyncio.sleep(0.01)  # Short sleep to prevent CPU spinning
+                        continue
 
-                    if not success or frame is None:
-                        consecutive_failures += 1
-                        print(f"Failed to read frame: {consecutive_failures}/{MAX_FAILURES}")
+                    # Update last frame time
+                    last_frame_time = current_time
 
-                        # Increase frame interval to reduce load on system
-                        current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
-                        print(f"Increasing frame interval to {current_interval:.2f}s")
+                    # capture_loop() drains the driver queue and decodes the newest frame
+                    if capture_task.done():
+                        # It only ends on an error outside STREAM_ERRORS: log it and restart it
+                        logger.error("Frame capture task stopped: %r", capture_task.exception())
+                        capture_task = asyncio.create_task(capture_loop())
+                    wait_until = time.monotonic() + HEARTBEAT_INTERVAL
+                    while True:
+                        try:
+                            captured_at, result = await asyncio.wait_for(
+                                frames.get(), max(0.0, wait_until - time.monotonic()))
+                        except asyncio.TimeoutError:
+                            # A capture stuck in the driver counts as a failed read, so
+                            # the fallback frame and camera reset still happen
+                            result = (False, None, 0)
+                            break
+                        fresh = time.monotonic() - captured_at <= current_interval
+                        # Set before task_done(), which lets capture_loop() go on: the next
+                        # frame is due in one interval, or now if this one is being dropped
+                        next_due = time.monotonic() + (current_interval if fresh else 0.0)
+                        frames.task_done()
+                        if fresh:
+                            break
+
+                    # capture_latest_frame() returns None when the camera is missing or closed
+                    if result is None:
+                        logger.warning("Camera not available, attempting to initialize/reopen...")
+
+                        # If camera exists, try to release it first
+                        if camera is not None:
+                            try:
+                                await camera_call(camera.release)
+                            except STREAM_ERRORS as e:
+                                logger.warning("Error releasing camera: %s", e)
+
+                        # Set camera to None to ensure clean state
+                        camera = None
 
-                        if consecutive_failures >= MAX_FAILURES:
-                            print("Too many consecutive failures, attempting to reset camera...")
+                        # Wait before reopening
+                        await asyncio.sleep(1)
 
-                            # Try to release the camera
-                            try:
-                                if camera is not None:
-                                    camera.release()
-                                    camera = None
-                            except Exception as e:
-                                print(f"Error releasing camera during reset: {e}")
-                                camera = None
-
-                            await asyncio.sleep(1)
-
-                            # Try to reinitialize the camera using the robust initialization function
-                            print("Attempting to reinitialize camera after consecutive failures...")
-                            camera = initialize_camera()
-
-                            if camera is not None and camera.isOpened():
-                                print("Successfully reset camera")
-                                # Read a test frame to verify camera is working
-                                test_success, _ = camera.read()
-                                if test_success:
-                                    print("Camera reset confirmed with successful frame read")
-                                else:
-                                    print("Camera reset succeeded but test frame read failed")
-                                    # If test frame read fails, try to release and reinitialize again
-                                    try:
-                                        camera.release()
-                                    except Exception as e:
-                                        print(f"Error releasing camera after failed test frame: {e}")
-                                    camera = None
-                            else:
-                                print("Failed to reset camera using all available methods")
-                                camera = None
+                        # Try to initialize/reopen the camera using the robust initialization function
+                        logger.info("Attempting to reinitialize camera...")
+                        camera = initialize_camera()
 
-                            # Reset failure counter after reset attempt
+                        if camera is not None and await camera_call(camera.isOpened):
+                            logger.info("Successfully reinitialized camera")
+                            # Reset failure counter on successful initialization
                             consecutive_failures = 0
+                            # Reset frame interval to default
+                            current_interval = MIN_FRAME_INTERVAL
+                        else:
+                            logger.warning("Failed to reinitialize camera using all available methods")
+                            camera = None
 
-                        # Use fallback frame when frame read fails
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
+                        # Use fallback frame regardless of initialization result
+                        # This ensures the stream continues even if camera init failed
+                        yield FALLBACK_CHUNK
                         continue
 
-                    # Reset failure counter and adjust frame interval on success
-                    if consecutive_failures > 0:
-                        print(f"Successfully read frame after {consecutive_failures} failures")
-                        consecutive_failures = 0
-
-                    # Gradually decrease frame interval on success (increase FPS)
-                    if current_interval > MIN_FRAME_INTERVAL:
-                        current_interval = max(current_interval * 0.9, MIN_FRAME_INTERVAL)
-
-                    # Encode the frame as JPEG
                     try:
-                        # Determine quality based on current performance
-                        quality = 70  # Default quality
-                        if current_interval > MIN_FRAME_INTERVAL * 2:
-                            # If we're struggling, reduce quality
-                            quality = 50
-
-                        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
-                        if not ret:
-                            print("Failed to encode frame")
-                            yield (b'--frame\r\n'
-                                   b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
-                        else:
-                            frame_bytes = buffer.tobytes()
+                        if isinstance(result, Exception):
+                            raise result
+                        success, frame, grabbed = result
+
+                        if grabbed > 1:
+                            dropped_frames += grabbed - 1
+                            if dropped_frames >= 100:
+                                logger.debug("Dropped %d stale frames to keep the stream current", dropped_frames)
+                                dropped_frames = 0
+
+                        if not success or frame is None:
+                            consecutive_failures += 1
+                            logger.debug("Failed to read frame: %d/%d", consecutive_failures, MAX_FAILURES)
+
+                            # Increase frame interval to reduce load on system
+                            current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
+                            logger.debug("Increasing frame interval to %.2fs", current_interval)
+
+                            if consecutive_failures >= MAX_FAILURES:
+                                logger.warning("Too many consecutive failures, attempting to reset camera...")
+
+                                # Try to release the camera; capture tasks that already
+                                # hold it see it closed once they get the lock
+                                try:
+                                    if camera is not None:
+                                        await camera_call(camera.release)
+                                        camera = None
+                                except STREAM_ERRORS as e:
+                                    logger.warning("Error releasing camera during reset: %s", e)
+                                    camera = None
 
-                            # Update heartbeat time when sending a real frame
-                            last_heartbeat_time = time.time()
+                                await asyncio.sleep(1)
+
+                                # Try to reinitialize the camera using the robust initialization function
+                                logger.info("Attempting to reinitialize camera after consecutive failures...")
+                                camera = initialize_camera()
+
+                                if camera is not None and await camera_call(camera.isOpened):
+                                    logger.info("Successfully reset camera")
+                                    # Read a test frame to verify camera is working
+                                    test_success, _ = await camera_call(camera.read)
+                                    if test_success:
+                                        logger.info("Camera reset confirmed with successful frame read")
+                                    else:
+                                        logger.warning("Camera reset succeeded but test frame read failed")
+                                        # If test frame read fails, try to release and reinitialize again
+                                        try:
+                                            await camera_call(camera.release)
+                                        except STREAM_ERRORS as e:
+                                            logger.warning("Error releasing camera after failed test frame: %s", e)
+                                        camera = None
+                                else:
+                                    logger.warning("Failed to reset camera using all available methods")
+                                    camera = None
 
-                            # Yield the frame in the multipart response format
-                            yield (b'--frame\r\n'
-                                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-                    except Exception as e:
-                        print(f"Error encoding frame: {e}")
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
+                                # Reset failure counter after reset attempt
+                                consecutive_failures = 0
 
-                except Exception as e:
-                    print(f"Error during frame capture: {e}")
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
+                            # Use fallback frame when frame read fails
+                            yield FALLBACK_CHUNK
+                            continue
 
-                    # Increase frame interval to reduce load
-                    current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
+                        # Reset failure counter and adjust frame interval on success
+                        if consecutive_failures > 0:
+                            logger.debug("Successfully read frame after %d failures", consecutive_failures)
+                            consecutive_failures = 0
 
-                # Explicitly delete frame to help with memory management
-                if frame is not None:
-                    del frame
+                        # Gradually decrease frame interval on success (increase FPS)
+                        if current_interval > MIN_FRAME_INTERVAL:
+                            current_interval = max(current_interval * 0.9, MIN_FRAME_INTERVAL)
 
-            except Exception as e:
-                print(f"Critical error in video stream: {e}")
-                # Use fallback frame for any unhandled exceptions
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
+                        # Encode the frame as JPEG
+                        try:
+                            # Determine quality based on current performance
+                            quality = JPEG_QUALITY  # Default quality
+                            if current_interval > MIN_FRAME_INTERVAL * 2:
+                                # If we're struggling, reduce quality
+                                quality = JPEG_QUALITY_LOW
+
+                            frame_bytes = await asyncio.get_running_loop().run_in_executor(
+                                ENCODER_POOL, encode_stream_frame, frame, quality, gray)
+                            if frame_bytes is None:
+                                logger.warning("Failed to encode frame")
+                                yield FALLBACK_CHUNK
+                            else:
+                                # Update heartbeat time when sending a real frame
+                                last_heartbeat_time = time.time()
+
+                                # Yield the frame in the multipart response format. The parts go
+                                # out as separate chunks so the JPEG isn't copied to add the framing.
+                                yield FRAME_HEADER
+                                yield frame_bytes
+                                yield FRAME_TRAILER
+                        except STREAM_ERRORS as e:
+                            logger.warning("Error encoding frame: %s", e)
+                            yield FALLBACK_CHUNK
+
+                    except STREAM_ERRORS as e:
+                        logger.warning("Error during frame capture: %s", e)
+                        yield FALLBACK_CHUNK
+
+                        # Increase frame interval to reduce load
+                        current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
 
-                # Sleep longer after errors to give system time to recover
-                await asyncio.sleep(0.5)
+                except STREAM_ERRORS as e:
+                    logger.error("Critical error in video stream: %s", e)
+                    # Use fallback frame for any unhandled exceptions
+                    yield FALLBACK_CHUNK
+
+                    # Sleep longer after errors to give system time to recover
+                    await asyncio.sleep(0.5)
+        finally:
+            # The client went away
+            capture_task.cancel()
 
     # Set response headers to help prevent the ERR_INCOMPLETE_CHUNKED_ENCODING error
     headers = {
@@ -899,9 +1145,9 @@ async def cleanup():
 
     # Release the camera if it exists and is open
     try:
-        if camera is not None and camera.isOpened():
+        if camera is not None:
             print("Releasing camera resources...")
-            camera.release()
+            await camera_call(camera.release)
             print("Camera released successfully")
     except Exception as e:
         print(f"Error releasing camera: {e}")
@@ -909,6 +1155,8 @@ async def cleanup():
     # Set camera to None to ensure it's properly garbage collected
     camera = None
 
+    ENCODER_POOL.shutdown(wait=False)
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
 
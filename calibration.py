@@ -1,31 +1,34 @@
 from quart import jsonify
 import cv2
+import numpy as np
+import threading
+import time
 from typing import Any, Dict, Optional, Tuple
 
 from stepper_hat_pigpio import Controller
 
 
-def find_markers(frame) -> Dict[str, Any]:
+# (dictionary, parameters, detector) built once by _get_detector(); detector is
+# None on OpenCV builds without the ArucoDetector class
+_detector = None
+_detector_lock = threading.Lock()
+
+
+def _get_detector(aruco):
     """
-    Extracted from calibrate: detect ArUco markers and compute marker centers and conditions.
-    Returns a plain dict (not a Response), so calibrate can jsonify it.
+    Build the ArUco dictionary, parameters and detector on first use and reuse them.
+    Raises if they can't be built; nothing is cached in that case, so the next call retries.
     """
-    # Verify ArUco module availability
-    aruco = getattr(cv2, 'aruco', None)
-    if aruco is None:
-        return {
-            "status": "error",
-            "message": "cv2.aruco is not available. Ensure opencv-contrib-python is installed."
-        }
+    global _detector
+    with _detector_lock:
+        if _detector is not None:
+            return _detector
 
-    # Select original ArUco dictionary to match stepper controller configuration
-    try:
+        # Select original ArUco dictionary to match stepper controller configuration
         if hasattr(aruco, 'getPredefinedDictionary'):
             dictionary = aruco.getPredefinedDictionary(aruco.DICT_ARUCO_ORIGINAL)
         else:
-            dictionary = aruco.Dictionary_get(aruco.DICT_ARUCO_ORIGINAL) \
-                if hasattr(aruco, 'DICT_ARUCO_ORIGINAL') \
-                else aruco.Dictionary_get(aruco.DICT_ARUCO_ORIGINAL)
+            dictionary = aruco.Dictionary_get(aruco.DICT_ARUCO_ORIGINAL)
 
         # Create detector parameters in a version-agnostic way
         parameters = None
@@ -42,6 +45,45 @@ def find_markers(frame) -> Dict[str, Any]:
                 parameters = aruco.DetectorParameters_create()
             except Exception:
                 parameters = None
+
+        detector = None
+        if hasattr(aruco, 'ArucoDetector'):
+            try:
+                detector = aruco.ArucoDetector(dictionary, parameters) if parameters is not None else aruco.ArucoDetector(dictionary)
+            except TypeError:
+                detector = aruco.ArucoDetector(dictionary)
+
+        _detector = (dictionary, parameters, detector)
+        return _detector
+
+
+# Last successful find_markers() result as (time.monotonic(), frame, result).
+# Calibration polled faster than frames arrive gets the same frame again, so
+# detection isn't rerun on it within DETECTION_TTL seconds.
+DETECTION_TTL = 0.2
+_last_detection: Tuple[float, Any, Optional[Dict[str, Any]]] = (0.0, None, None)
+
+
+def find_markers(frame) -> Dict[str, Any]:
+    """
+    Extracted from calibrate: detect ArUco markers and compute marker centers and conditions.
+    Returns a plain dict (not a Response), so calibrate can jsonify it.
+    """
+    global _last_detection
+    detected_at, last_frame, last_result = _last_detection
+    if frame is last_frame and time.monotonic() - detected_at < DETECTION_TTL:
+        return last_result
+
+    # Verify ArUco module availability
+    aruco = getattr(cv2, 'aruco', None)
+    if aruco is None:
+        return {
+            "status": "error",
+            "message": "cv2.aruco is not available. Ensure opencv-contrib-python is installed."
+        }
+
+    try:
+        dictionary, parameters, detector = _get_detector(aruco)
     except Exception as e:
         return {
             "status": "error",
@@ -49,11 +91,7 @@ def find_markers(frame) -> Dict[str, Any]:
         }
 
     try:
-        if hasattr(aruco, 'ArucoDetector'):
-            try:
-                detector = aruco.ArucoDetector(dictionary, parameters) if parameters is not None else aruco.ArucoDetector(dictionary)
-            except TypeError:
-                detector = aruco.ArucoDetector(dictionary)
+        if detector is not None:
             corners, ids, _ = detector.detectMarkers(frame)
         else:
             if parameters is not None:
@@ -63,25 +101,24 @@ def find_markers(frame) -> Dict[str, Any]:
     except Exception as e:
         return {"status": "error", "message": f"Error during ArUco detection: {e}"}
 
+    h, w = int(frame.shape[0]), int(frame.shape[1])
     result = {
         "status": "success",
         "found": False,
         "markers": {},
         "conditions": {"id1_top_right": False, "id2_bottom_left": False},
-        "image_size": {"width": int(frame.shape[1]), "height": int(frame.shape[0])}
+        "image_size": {"width": w, "height": h}
     }
 
     if ids is not None and len(ids) > 0:
         id_list = [int(x) for x in ids.flatten().tolist()]
+        # Centers of all markers in one reduction: (N, 4 corners, 2) -> (N, 2)
+        centers = np.stack([c[0] for c in corners]).mean(axis=1)
+        norms = centers * np.array([1.0 / w, 1.0 / h])
         for idx, marker_id in enumerate(id_list):
-            pts = corners[idx][0]
-            cx = float(pts[:, 0].mean())
-            cy = float(pts[:, 1].mean())
-            norm_x = cx / frame.shape[1]
-            norm_y = cy / frame.shape[0]
             result["markers"][str(marker_id)] = {
-                "center": {"x": cx, "y": cy},
-                "center_norm": {"x": norm_x, "y": norm_y}
+                "center": {"x": float(centers[idx, 0]), "y": float(centers[idx, 1])},
+                "center_norm": {"x": float(norms[idx, 0]), "y": float(norms[idx, 1])}
             }
         id1 = result["markers"].get("1")
         id2 = result["markers"].get("2")
@@ -93,6 +130,7 @@ def find_markers(frame) -> Dict[str, Any]:
     else:
         result["message"] = "No ArUco markers detected"
 
+    _last_detection = (time.monotonic(), frame, result)
     return result
 
 
@@ -103,14 +141,16 @@ def centre_on_markers(camera, controller: Controller, markers: Dict[str, Any]) -
     return {"status": "not_implemented", "message": "centering logic will be implemented later"}
 
 
-def calibrate(camera, controller: Controller):
+def calibrate(camera, controller: Controller, frame=None):
     """
        Step 1 refactor: call find_markers; once two markers are found, call centre_on_markers.
+       frame: a recently captured frame to use instead of reading one from the camera.
     """
-    # Attempt to read a single frame
-    success, frame = camera.read()
-    if not success or frame is None:
-        return jsonify({"status": "error", "message": "Failed to read frame for calibration"})
+    if frame is None:
+        # Attempt to read a single frame
+        success, frame = camera.read()
+        if not success or frame is None:
+            return jsonify({"status": "error", "message": "Failed to read frame for calibration"})
 
     detection = find_markers(frame)
     # If detection itself failed (status error), return it as-is
@@ -5,12 +5,40 @@ import os
 import socket
 import sys
 import time
+import threading
 import asyncio
+import logging
+from logging.handlers import RotatingFileHandler
+from concurrent.futures import ThreadPoolExecutor
 import cv2
 import numpy as np
 
 from quart import Quart, jsonify, render_template, Response, request
 
+# uvloop is a faster drop-in event loop for the many long-lived SSE/MJPEG
+# streams; it isn't available on Windows, where the stock loop is used
+try:
+    import uvloop
+    _HAS_UVLOOP = True
+except ImportError:
+    _HAS_UVLOOP = False
+
+# simplejpeg wraps libjpeg-turbo and returns the JPEG as bytes, without the
+# frame-sized copy cv2.imencode(...).tobytes() makes; cv2 is the fallback
+try:
+    import simplejpeg
+    _HAS_SIMPLEJPEG = True
+except ImportError:
+    _HAS_SIMPLEJPEG = False
+
+# orjson encodes the jsonify() responses several times faster than stdlib json
+try:
+    import orjson
+    from quart.json.provider import DefaultJSONProvider
+    _HAS_ORJSON = True
+except ImportError:
+    _HAS_ORJSON = False
+
 from calibration import calibrate
 # Select motor backend at import time based on env var STEPPER_BACKEND
 backend = os.getenv("STEPPER_BACKEND", "pigpio").lower()
@@ -32,10 +60,35 @@ except Exception as _backend_err:
     except Exception as _gpio_err:
         raise RuntimeError(f"No motor backend available. rpimotorlib error: {_backend_err}; gpio error: {_gpio_err}")
 
+# Backends with a combined move(pan, tilt) update both axes in one call
+_controller_move = getattr(controller, 'move', None)
+
+def move_pan_tilt(pan, tilt):
+    if _controller_move is not None:
+        _controller_move(pan, tilt)
+    else:
+        controller.pan(pan)
+        controller.tilt(tilt)
+
 
 # Initialize the webcam variable, but don't open it yet
 # We'll open it in the setup function to ensure proper initialization
 camera = None
+CAMERA_INDEX = None  # Index `camera` was opened at, set by initialize_camera*()
+
+# cv2.VideoCapture isn't thread-safe, and the producer reads it from JPEG_POOL
+# while handlers may release, read or query it. Every call on `camera` holds
+# CAMERA_LOCK; from the event loop, go through camera_call() so the loop never
+# waits on the lock itself.
+CAMERA_LOCK = threading.Lock()
+
+def _locked_camera_call(func, *args):
+    with CAMERA_LOCK:
+        return func(*args)
+
+async def camera_call(func, *args):
+    """Runs func(*args) (e.g. camera.read) under CAMERA_LOCK in the default executor."""
+    return await asyncio.get_running_loop().run_in_executor(None, _locked_camera_call, func, *args)
 
 # Camera configuration
 CAMERA_CONFIG = {
@@ -47,7 +100,121 @@ CAMERA_CONFIG = {
     'error_log_file': 'camera_errors.log'  # File to log camera errors
 }
 
-# Initialize error logging
+# JPEG encoding and frame decoding run here so they don't block the event loop
+# (and with it the SSE endpoints) while a frame is being processed
+JPEG_POOL = ThreadPoolExecutor(max_workers=2)
+
+# JPEG encode parameters, built once and shared by every imencode call.
+# The optimize pass is skipped explicitly: it costs more than it saves on a Pi.
+JPEG_PARAMS_NORMAL = [cv2.IMWRITE_JPEG_QUALITY, 70, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+JPEG_PARAMS_LOW = [cv2.IMWRITE_JPEG_QUALITY, 50, cv2.IMWRITE_JPEG_OPTIMIZE, 0]  # When struggling to keep up
+JPEG_PARAMS_HEARTBEAT = [cv2.IMWRITE_JPEG_QUALITY, 30, cv2.IMWRITE_JPEG_OPTIMIZE, 0]
+
+def encode_jpeg(frame, params):
+    """
+    JPEG-encode a BGR frame with one of the JPEG_PARAMS_* lists.
+
+    Returns:
+        bytes or None: The encoded frame, or None if encoding failed
+    """
+    if _HAS_SIMPLEJPEG:
+        # The JPEG_PARAMS_* lists start with IMWRITE_JPEG_QUALITY, quality
+        return simplejpeg.encode_jpeg(np.ascontiguousarray(frame), quality=params[1],
+                                      colorspace='BGR', colorsubsampling='420', fastdct=True)
+    ret, buffer = cv2.imencode('.jpg', frame, params)
+    return buffer.tobytes() if ret else None
+
+# MJPEG multipart framing, built once instead of on every /video_feed request
+FRAME_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+FRAME_TRAILER = b'\r\n'
+
+def _make_fallback_jpeg():
+    """Black 640x480 frame shown when the camera is unavailable."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    cv2.putText(frame, "Camera Unavailable", (120, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    return cv2.imencode('.jpg', frame)[1].tobytes()
+
+def _make_heartbeat_jpeg():
+    """Tiny black frame sent to keep the connection alive."""
+    return cv2.imencode('.jpg', np.zeros((8, 8, 3), dtype=np.uint8), JPEG_PARAMS_HEARTBEAT)[1].tobytes()
+
+# Only the encoded bytes are kept; the source arrays are freed after import
+FALLBACK_JPEG = _make_fallback_jpeg()
+FALLBACK_MULTIPART = FRAME_HEADER + FALLBACK_JPEG + FRAME_TRAILER
+HEARTBEAT_JPEG = _make_heartbeat_jpeg()
+HEARTBEAT_MULTIPART = FRAME_HEADER + HEARTBEAT_JPEG + FRAME_TRAILER
+HEARTBEAT_INTERVAL = 2.0  # Send a heartbeat every 2 seconds if no frames
+
+# One camera_producer() task captures and encodes frames for every /video_feed
+# viewer. It publishes each JPEG to LATEST_FRAME and pulses FRAME_READY.
+LATEST_FRAME = b''
+FRAME_READY = asyncio.Event()
+VIEWERS = 0
+_producer_task = None
+
+# The producer also keeps its newest decoded frame, so /start_calibration can
+# use it rather than reading the camera while the stream is running
+LATEST_RAW_FRAME = None
+LATEST_RAW_TIME = 0.0  # time.monotonic() when LATEST_RAW_FRAME was captured
+RAW_FRAME_MAX_AGE = 0.5  # Older frames are stale; calibration reads the camera instead
+
+# SSE endpoints send one update per SSE_INTERVAL; /control moves the motors
+# every MOTOR_INTERVAL in between
+SSE_INTERVAL = 0.5
+MOTOR_INTERVAL = 0.005
+
+# /control sine sweep: angle = SINE_SCALE * sin(SINE_OMEGA * t)
+SINE_OMEGA = 2.0
+SINE_SCALE = 90
+
+# The angle is an int degree anyway, so the sine comes from a table over one
+# period instead of a math.sin call per update
+_SIN_LUT_SIZE = 1024
+_SIN_LUT = [int(SINE_SCALE * math.sin(i * 2 * math.pi / _SIN_LUT_SIZE)) for i in range(_SIN_LUT_SIZE)]
+_SIN_LUT_STEP = SINE_OMEGA * _SIN_LUT_SIZE / (2 * math.pi)  # Table entries per second
+
+# Pre-encoded SSE message templates, filled in with %-substitution
+ANGLE_TMPL = b'data: {"angle": %d}\n\n'
+RESET_TMPL = b'data: {"pan": 0, "tilt": 0, "remaining": %.1f}\n\n'
+RESET_DONE = b'data: {"pan": 0, "tilt": 0, "remaining": 0, "status": "complete"}\n\n'
+SET_TMPL = b'data: {"pan": %d, "tilt": %d, "remaining": %.1f}\n\n'
+SET_DONE_TMPL = b'data: {"pan": %d, "tilt": %d, "remaining": 0, "status": "complete"}\n\n'
+
+# Initialize error logging. The handler keeps the log file open (rather than
+# reopening it for every line) and rotates it so it can't grow unbounded.
+_camera_log_handler = RotatingFileHandler(
+    CAMERA_CONFIG['error_log_file'], maxBytes=1024 * 1024, backupCount=1, delay=True)
+_camera_log_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s', '%Y-%m-%d %H:%M:%S'))
+camera_log = logging.getLogger('fanturret.camera')
+camera_log.addHandler(_camera_log_handler)
+camera_log.setLevel(logging.INFO)
+camera_log.propagate = False
+
+# Per-frame messages from the video stream go through this logger rather than
+# print(), so they cost nothing below the configured level (LOG_LEVEL env var,
+# default INFO; per-frame messages are DEBUG)
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper())
+logger = logging.getLogger(__name__)
+
+class _RateLimitFilter(logging.Filter):
+    """Drops repeats of the same message logged within `interval` seconds."""
+
+    def __init__(self, interval=5.0):
+        super().__init__()
+        self.interval = interval
+        self._last = {}
+
+    def filter(self, record):
+        now = time.monotonic()
+        key = (record.levelno, record.msg)
+        if now - self._last.get(key, -self.interval) < self.interval:
+            return False
+        self._last[key] = now
+        return True
+
+# A camera that keeps failing would otherwise log the same lines on every frame
+logger.addFilter(_RateLimitFilter())
+
 def log_camera_error(error_message):
     """
     Log camera errors to a file for later analysis.
@@ -56,78 +223,72 @@ def log_camera_error(error_message):
         error_message (str): The error message to log
     """
     try:
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
-        with open(CAMERA_CONFIG['error_log_file'], 'a') as f:
-            f.write(f"{timestamp} - {error_message}\n")
+        camera_log.info(error_message)
     except Exception as e:
         print(f"Error writing to log file: {e}")
         # If we can't write to the log file, just print to console
         print(f"CAMERA ERROR: {error_message}")
 
-def initialize_camera(attempt=1, last_error=None):
+def _camera_attempts():
     """
-    Initialize the camera with robust error handling and fallback options.
+    Yields (attempt, camera_index) for each initialization attempt.
 
-    This function attempts to initialize the camera using the primary index first,
-    then falls back to backup indices if the primary fails. It also includes retry
-    logic and detailed error reporting.
+    The primary index is tried first, then each backup index, then the primary
+    index again until max_init_attempts is reached.
+    """
+    for attempt in range(1, CAMERA_CONFIG['max_init_attempts'] + 1):
+        if attempt == 1:
+            # First attempt, try the primary index
+            camera_index = CAMERA_CONFIG['primary_index']
+            print(f"Attempting to initialize camera with primary index {camera_index}...")
+        else:
+            # Subsequent attempts, try backup indices
+            backup_index = attempt - 2  # -2 because attempt starts at 1 and we want to start at index 0
+            if backup_index < len(CAMERA_CONFIG['backup_indices']):
+                camera_index = CAMERA_CONFIG['backup_indices'][backup_index]
+                print(f"Attempting to initialize camera with backup index {camera_index} (attempt {attempt}/{CAMERA_CONFIG['max_init_attempts']})...")
+            else:
+                # If we've tried all backup indices, retry the primary index
+                camera_index = CAMERA_CONFIG['primary_index']
+                print(f"Retrying primary camera index {camera_index} (attempt {attempt}/{CAMERA_CONFIG['max_init_attempts']})...")
+        yield attempt, camera_index
 
-    Args:
-        attempt (int): Current attempt number (used for recursion)
-        last_error (Exception): The last error encountered (used for logging)
+def _aggressive_reset():
+    """
+    Try to reset the system's camera subsystem before a retry.
 
     Returns:
-        cv2.VideoCapture or None: Initialized camera object or None if all attempts fail
+        float: How long to wait (in seconds) before opening the camera again
     """
-    global camera
-
-    # If we've exceeded the maximum number of attempts, give up
-    if attempt > CAMERA_CONFIG['max_init_attempts']:
-        error_msg = f"Failed to initialize camera after {attempt-1} attempts. Last error: {last_error}"
-        log_camera_error(error_msg)
-        print(f"ERROR: {error_msg}")
-        return None
+    try:
+        # On Windows, we can try to release and reinitialize the camera API
+        if sys.platform == 'win32':
+            print("Performing aggressive camera reset (Windows)...")
+            # Release all OpenCV windows to free resources
+            cv2.destroyAllWindows()
+            # Force garbage collection to release any lingering resources
+            import gc
+            gc.collect()
+        # On Linux, we might try different approaches
+        elif sys.platform.startswith('linux'):
+            print("Performing aggressive camera reset (Linux)...")
+            # On Linux, we could potentially use v4l2-ctl to reset the camera
+            # This would require the v4l-utils package to be installed
+            # For now, we'll just do a longer sleep
+            return CAMERA_CONFIG['init_retry_delay'] * 2
+    except Exception as e:
+        log_camera_error(f"Error during aggressive reset: {e}")
+        print(f"WARNING: Error during aggressive reset: {e}")
+    return 0
 
-    # Determine which camera index to try
-    if attempt == 1:
-        # First attempt, try the primary index
-        camera_index = CAMERA_CONFIG['primary_index']
-        print(f"Attempting to initialize camera with primary index {camera_index}...")
-    else:
-        # Subsequent attempts, try backup indices
-        backup_index = attempt - 2  # -2 because attempt starts at 1 and we want to start at index 0
-        if backup_index < len(CAMERA_CONFIG['backup_indices']):
-            camera_index = CAMERA_CONFIG['backup_indices'][backup_index]
-            print(f"Attempting to initialize camera with backup index {camera_index} (attempt {attempt}/{CAMERA_CONFIG['max_init_attempts']})...")
-        else:
-            # If we've tried all backup indices, retry the primary index
-            camera_index = CAMERA_CONFIG['primary_index']
-            print(f"Retrying primary camera index {camera_index} (attempt {attempt}/{CAMERA_CONFIG['max_init_attempts']})...")
+def _open_camera(camera_index):
+    """
+    Make one attempt at opening the camera at camera_index.
 
+    Returns:
+        tuple: (cv2.VideoCapture, None) on success, or (None, Exception) on failure
+    """
     try:
-        # If aggressive reset is enabled and this is not the first attempt,
-        # try to reset the system's camera subsystem
-        if CAMERA_CONFIG['aggressive_reset'] and attempt > 1:
-            try:
-                # On Windows, we can try to release and reinitialize the camera API
-                if sys.platform == 'win32':
-                    print("Performing aggressive camera reset (Windows)...")
-                    # Release all OpenCV windows to free resources
-                    cv2.destroyAllWindows()
-                    # Force garbage collection to release any lingering resources
-                    import gc
-                    gc.collect()
-                # On Linux, we might try different approaches
-                elif sys.platform.startswith('linux'):
-                    print("Performing aggressive camera reset (Linux)...")
-                    # On Linux, we could potentially use v4l2-ctl to reset the camera
-                    # This would require the v4l-utils package to be installed
-                    # For now, we'll just do a longer sleep
-                    time.sleep(CAMERA_CONFIG['init_retry_delay'] * 2)
-            except Exception as e:
-                log_camera_error(f"Error during aggressive reset: {e}")
-                print(f"WARNING: Error during aggressive reset: {e}")
-
         # Attempt to initialize the camera
         cam = cv2.VideoCapture(camera_index)
 
@@ -146,7 +307,7 @@ def initialize_camera(attempt=1, last_error=None):
                 print(f"SUCCESS: Test frame read successful from camera index {camera_index}")
                 # Log successful initialization
                 log_camera_error(f"Camera successfully initialized with index {camera_index}")
-                return cam
+                return cam, None
             else:
                 error_msg = f"Camera opened with index {camera_index} but test frame read failed"
                 log_camera_error(error_msg)
@@ -160,60 +321,141 @@ def initialize_camera(attempt=1, last_error=None):
                     log_camera_error(error_msg)
                     print(f"ERROR: {error_msg}")
 
-                # Wait before trying again
-                time.sleep(CAMERA_CONFIG['init_retry_delay'])
-                return initialize_camera(attempt + 1, Exception("Test frame read failed"))
+                return None, Exception("Test frame read failed")
         else:
             error_msg = f"Failed to open camera with index {camera_index}"
             log_camera_error(error_msg)
             print(f"WARNING: {error_msg}")
-
-            # Wait before trying again
-            time.sleep(CAMERA_CONFIG['init_retry_delay'])
-            return initialize_camera(attempt + 1, Exception(error_msg))
+            return None, Exception(error_msg)
 
     except Exception as e:
         error_msg = f"Exception during camera initialization with index {camera_index}: {e}"
         log_camera_error(error_msg)
         print(f"ERROR: {error_msg}")
+        return None, e
+
+def _camera_init_failed(last_error):
+    error_msg = f"Failed to initialize camera after {CAMERA_CONFIG['max_init_attempts']} attempts. Last error: {last_error}"
+    log_camera_error(error_msg)
+    print(f"ERROR: {error_msg}")
+    return None
+
+def initialize_camera():
+    """
+    Initialize the camera with robust error handling and fallback options.
+
+    This function attempts to initialize the camera using the primary index first,
+    then falls back to backup indices if the primary fails. It also includes retry
+    logic and detailed error reporting. It blocks while retrying, so it is meant
+    for startup; request handlers use initialize_camera_async().
+
+    Returns:
+        cv2.VideoCapture or None: Initialized camera object or None if all attempts fail
+    """
+    global CAMERA_INDEX
+    last_error = None
+    for attempt, camera_index in _camera_attempts():
+        # If aggressive reset is enabled and this is not the first attempt,
+        # try to reset the system's camera subsystem
+        if CAMERA_CONFIG['aggressive_reset'] and attempt > 1:
+            time.sleep(_aggressive_reset())
+
+        cam, last_error = _open_camera(camera_index)
+        if cam is not None:
+            CAMERA_INDEX = camera_index
+            return cam
 
         # Wait before trying again
         time.sleep(CAMERA_CONFIG['init_retry_delay'])
-        return initialize_camera(attempt + 1, e)
+
+    return _camera_init_failed(last_error)
+
+async def initialize_camera_async():
+    """
+    Same as initialize_camera(), but waits between attempts without blocking
+    the event loop, so other endpoints keep serving during the retries.
+
+    Returns:
+        cv2.VideoCapture or None: Initialized camera object or None if all attempts fail
+    """
+    global CAMERA_INDEX
+    loop = asyncio.get_running_loop()
+    last_error = None
+    for attempt, camera_index in _camera_attempts():
+        if CAMERA_CONFIG['aggressive_reset'] and attempt > 1:
+            await asyncio.sleep(_aggressive_reset())
+
+        # Opening the device can itself take a few hundred ms
+        cam, last_error = await loop.run_in_executor(None, _open_camera, camera_index)
+        if cam is not None:
+            CAMERA_INDEX = camera_index
+            return cam
+
+        await asyncio.sleep(CAMERA_CONFIG['init_retry_delay'])
+
+    return _camera_init_failed(last_error)
+
+def _probe_camera(index, held_index=None):
+    """
+    Check whether a camera can be opened at index.
+
+    Only isOpened() is checked; reading a frame would add another driver
+    round-trip per index. The backend is named explicitly because letting
+    OpenCV auto-probe every backend is slow. held_index is the index the
+    app's camera is already open at: it is reported without opening it again.
+
+    Returns:
+        int or None: index if a camera opened there, otherwise None
+    """
+    if index == held_index:
+        print(f"Camera at index {index} is in use by the app")
+        return index
+    if sys.platform.startswith('linux'):
+        api = cv2.CAP_V4L2
+    elif sys.platform == 'win32':
+        api = cv2.CAP_DSHOW
+    else:
+        api = cv2.CAP_ANY
+    try:
+        cap = cv2.VideoCapture(index, api)
+        try:
+            if cap.isOpened():
+                print(f"Found camera at index {index}")
+                return index
+            print(f"No camera found at index {index}")
+        finally:
+            cap.release()
+    except Exception as e:
+        print(f"Error checking camera at index {index}: {e}")
+    return None
 
 def get_available_cameras(max_to_check=10):
     """
     Detect available cameras on the system.
 
-    This function attempts to open each camera index from 0 to max_to_check-1
-    and returns a list of indices that were successfully opened.
+    This function tries camera indices from 0 to max_to_check-1 and stops at
+    the first one that opens. The indices are probed four at a time, since
+    opening a device can take hundreds of ms.
 
     Args:
         max_to_check (int): Maximum number of camera indices to check
 
     Returns:
-        list: List of available camera indices
+        list: The first available camera index, or an empty list
     """
-    available_cameras = []
-
     print("Scanning for available cameras...")
-    for i in range(max_to_check):
-        try:
-            cap = cv2.VideoCapture(i)
-            if cap.isOpened():
-                # Try to read a frame to confirm it's working
-                success, _ = cap.read()
-                if success:
-                    available_cameras.append(i)
-                    print(f"Found working camera at index {i}")
-                    break
-                else:
-                    print(f"Camera at index {i} opened but frame read failed")
-                cap.release()
-            else:
-                print(f"No camera found at index {i}")
-        except Exception as e:
-            print(f"Error checking camera at index {i}: {e}")
+    held_index = CAMERA_INDEX if camera is not None else None
+    available_cameras = []
+    pool = ThreadPoolExecutor(max_workers=4)
+    try:
+        # map() yields in index order, so this is the lowest index that opened
+        for index in pool.map(_probe_camera, range(max_to_check), [held_index] * max_to_check):
+            if index is not None:
+                available_cameras.append(index)
+                break
+    finally:
+        # Don't go on to open the indices past the one found
+        pool.shutdown(wait=True, cancel_futures=True)
 
     if available_cameras:
         print(f"Found {len(available_cameras)} available cameras: {available_cameras}")
@@ -222,7 +464,25 @@ def get_available_cameras(max_to_check=10):
 
     return available_cameras
 
+if _HAS_ORJSON:
+    class OrjsonProvider(DefaultJSONProvider):
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, default=self.default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            # Hand orjson's bytes straight to the response, without the
+            # bytes -> str -> bytes round trip the default provider makes
+            obj = self._prepare_response_obj(args, kwargs)
+            body = orjson.dumps(obj, default=self.default,
+                                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+            return self._app.response_class(body, mimetype=self.mimetype)
+
 app = Quart(__name__)
+if _HAS_ORJSON:
+    app.json = OrjsonProvider(app)
 
 @app.route('/')
 async def index():
@@ -241,39 +501,49 @@ async def control():
 
     This endpoint returns a stream of Server-Sent Events (SSE) with position updates.
     The pan and tilt mechanism will move in a sine wave pattern, with both pan and tilt
-    angles following the same pattern. Updates are sent to the client approximately
-    every 100 iterations (about every 0.5 seconds).
+    angles following the same pattern. Updates are sent to the client every
+    SSE_INTERVAL (0.5 seconds); the motors are updated every MOTOR_INTERVAL.
 
     Returns:
         Response: A streaming response with Server-Sent Events containing position updates.
     """
     async def generate():
-        count = 0
-        while True:
-            # Get the time in seconds
-            t = time.time()
-
-            # Generate an angle using a sine wave (-1 to 1) multiplied by 90 (-90 to 90)
-            a = math.sin(t * 2) * 90
-
-            # Cast a to int for v0.0.2
-            a = int(a)
-
-            controller.pan(a)
-            controller.tilt(a)
-
-            # Two decimal places is quite enough!
-            angle = round(a, 2)
-            print(angle)
-
-            # Send an update every 100 iterations
-            count += 1
-            if count >= 100:
-                yield f"data: {{\"angle\": {angle}}}\n\n"
-                count = 0
-
-            # Sleep for a bit so we're not hammering the HAT with updates
-            await asyncio.sleep(0.005)
+        # Angles waiting to be sent to the client. The motors run in their own
+        # task and never wait on the client: if it stalls, the oldest queued
+        # angle is dropped instead.
+        updates = asyncio.Queue(maxsize=4)
+
+        async def drive():
+            # t advances by exactly MOTOR_INTERVAL per update and each sleep
+            # runs to that update's scheduled time, so the clock is read once
+            # per update and the phase doesn't drift with sleep overshoot
+            loop = asyncio.get_running_loop()
+            t0 = loop.time()
+            t = 0.0
+            while True:
+                # A batch of motor updates per SSE message
+                for _ in range(int(SSE_INTERVAL / MOTOR_INTERVAL)):
+                    # Generate an angle using a sine wave (-1 to 1) multiplied by 90 (-90 to 90),
+                    # cast to int for v0.0.2
+                    a = _SIN_LUT[int(t * _SIN_LUT_STEP) & (_SIN_LUT_SIZE - 1)]
+
+                    move_pan_tilt(a, a)
+
+                    # Sleep for a bit so we're not hammering the HAT with updates
+                    t += MOTOR_INTERVAL
+                    await asyncio.sleep(max(0, t0 + t - loop.time()))
+
+                if updates.full():
+                    updates.get_nowait()
+                updates.put_nowait(a)
+
+        motor_task = asyncio.create_task(drive())
+        try:
+            while True:
+                yield ANGLE_TMPL % await updates.get()
+        finally:
+            # The client went away
+            motor_task.cancel()
 
     return app.response_class(
         generate(),
@@ -288,8 +558,8 @@ async def reset(duration=10):
     Resets the pan and tilt positions to 0 and maintains the position.
 
     This endpoint sets both the pan and tilt angles to 0, which is the center position.
-    The position is maintained by continuously sending signals to the servos for the specified
-    duration (in seconds).
+    The position is re-sent with every update (every SSE_INTERVAL) for the specified
+    duration (in seconds); the stepper axes hold their target in between.
 
     Args:
         duration (int, optional): How long to maintain the position in seconds. Defaults to 10.
@@ -300,31 +570,22 @@ async def reset(duration=10):
     """
     # If duration is 0, just set the position once and return
     if duration <= 0:
-        controller.tilt(0)
-        controller.pan(0)
+        move_pan_tilt(0, 0)
         return jsonify({"status": "Pan and tilt reset to 0 (one-time)"})
 
     async def generate():
-        count = 0
-        start_time = time.time()
-        end_time = start_time + duration
+        # The number of updates is known up front, so the loop needs no clock
+        for i in range(math.ceil(duration / SSE_INTERVAL)):
+            # Re-send the reset position with each update
+            move_pan_tilt(0, 0)
 
-        while time.time() < end_time:
-            # Continuously send the reset position commands
-            controller.pan(0)
-            controller.tilt(0)
+            yield RESET_TMPL % (duration - i * SSE_INTERVAL)
 
-            # Send an update every 100 iterations
-            count += 1
-            if count >= 100:
-                yield f"data: {{\"pan\": 0, \"tilt\": 0, \"remaining\": {round(end_time - time.time(), 1)}}}\n\n"
-                count = 0
-
-            # Sleep for a bit so we're not hammering the HAT with updates
-            await asyncio.sleep(0.005)
+            # Wake up only when the next update is due
+            await asyncio.sleep(SSE_INTERVAL)
 
         # Send a final update
-        yield f"data: {{\"pan\": 0, \"tilt\": 0, \"remaining\": 0, \"status\": \"complete\"}}\n\n"
+        yield RESET_DONE
 
     return app.response_class(
         generate(),
@@ -332,6 +593,9 @@ async def reset(duration=10):
         headers={'Cache-Control': 'no-cache', 'Connection': 'keep-alive'}
     )
 
+def _clamp90(x):
+    return -90 if x < -90 else 90 if x > 90 else x
+
 @app.route('/set/<int:pan>/<int:tilt>')
 @app.route('/set/<int:pan>/<int:tilt>/<int:duration>')
 async def set_position(pan, tilt, duration=10):
@@ -340,8 +604,8 @@ async def set_position(pan, tilt, duration=10):
 
     This endpoint allows manual control of the pan and tilt mechanism by setting
     specific angles for both axes. Values are clamped to the valid range of -90 to 90 degrees.
-    The position is maintained by continuously sending signals to the servos for the specified
-    duration (in seconds).
+    The position is re-sent with every update (every SSE_INTERVAL) for the specified
+    duration (in seconds); the stepper axes hold their target in between.
 
     Args:
         pan (int): The pan angle in degrees (-90 to 90).
@@ -352,16 +616,15 @@ async def set_position(pan, tilt, duration=10):
         Response: A streaming response with Server-Sent Events containing position updates,
                  or a JSON response if duration is 0.
     """
-    pan = 1000 - pan
-    tilt = 1000 - tilt
-    # Ensure values are within the valid range (-90 to 90)
-    pan = max(-90, min(90, pan))
-    tilt = max(-90, min(90, tilt))
+    # <int:> routes can't take negative numbers, so the position control page
+    # sends angle + 1000; undo that offset (the axes are mounted inverted, hence
+    # 1000 - x rather than x - 1000) and keep within the valid range (-90 to 90)
+    pan = _clamp90(1000 - pan)
+    tilt = _clamp90(1000 - tilt)
 
     # If duration is 0, just set the position once and return
     if duration <= 0:
-        controller.pan(pan)
-        controller.tilt(tilt)
+        move_pan_tilt(pan, tilt)
 
         return jsonify({
             "status": "Position set (one-time)",
@@ -370,26 +633,18 @@ async def set_position(pan, tilt, duration=10):
         })
 
     async def generate():
-        count = 0
-        start_time = time.time()
-        end_time = start_time + duration
-
-        while time.time() < end_time:
-            # Continuously send the same position commands to maintain the position
-            controller.pan(pan)
-            controller.tilt(tilt)
+        # The number of updates is known up front, so the loop needs no clock
+        for i in range(math.ceil(duration / SSE_INTERVAL)):
+            # Re-send the same position with each update to maintain it
+            move_pan_tilt(pan, tilt)
 
-            # Send an update every 100 iterations
-            count += 1
-            if count >= 100:
-                yield f"data: {{\"pan\": {pan}, \"tilt\": {tilt}, \"remaining\": {round(end_time - time.time(), 1)}}}\n\n"
-                count = 0
+            yield SET_TMPL % (pan, tilt, duration - i * SSE_INTERVAL)
 
-            # Sleep for a bit so we're not hammering the HAT with updates
-            await asyncio.sleep(0.005)
+            # Wake up only when the next update is due
+            await asyncio.sleep(SSE_INTERVAL)
 
         # Send a final update
-        yield f"data: {{\"pan\": {pan}, \"tilt\": {tilt}, \"remaining\": 0, \"status\": \"complete\"}}\n\n"
+        yield SET_DONE_TMPL % (pan, tilt)
 
     return app.response_class(
         generate(),
@@ -413,9 +668,39 @@ async def position_control():
 
 @app.route('/start_calibration', methods=['POST'])
 async def start_calibration():
-    return calibrate(camera, controller)
-
-
+    frame = None
+    if time.monotonic() - LATEST_RAW_TIME <= RAW_FRAME_MAX_AGE:
+        frame = LATEST_RAW_FRAME
+    else:
+        # Read here rather than letting calibrate() call camera.read() unlocked
+        success = False
+        if camera is not None:
+            success, frame = await camera_call(camera.read)
+        if not success or frame is None:
+            return jsonify({"status": "error", "message": "Failed to read frame for calibration"})
+    return calibrate(camera, controller, frame)
+
+
+
+# (timestamp, properties) from the last /camera_diagnostics property fetch.
+# The properties don't change after init, so they are reused for a few seconds.
+_PROPS_CACHE = (0.0, None)
+PROPS_CACHE_TTL = 5.0
+
+def _fetch_all_props(cam):
+    """Reads all the diagnostic properties from cam in one go."""
+    return {
+        "width": cam.get(cv2.CAP_PROP_FRAME_WIDTH),
+        "height": cam.get(cv2.CAP_PROP_FRAME_HEIGHT),
+        "fps": cam.get(cv2.CAP_PROP_FPS),
+        "brightness": cam.get(cv2.CAP_PROP_BRIGHTNESS),
+        "contrast": cam.get(cv2.CAP_PROP_CONTRAST),
+        "saturation": cam.get(cv2.CAP_PROP_SATURATION),
+        "hue": cam.get(cv2.CAP_PROP_HUE),
+        "gain": cam.get(cv2.CAP_PROP_GAIN),
+        "exposure": cam.get(cv2.CAP_PROP_EXPOSURE),
+        "backend": cam.getBackendName()
+    }
 
 @app.route('/camera_diagnostics')
 async def camera_diagnostics():
@@ -433,37 +718,32 @@ async def camera_diagnostics():
     Returns:
         JSON: Detailed diagnostic information about the camera.
     """
-    global camera
+    global camera, _PROPS_CACHE
 
-    # Get available cameras
-    available_cameras = get_available_cameras(max_to_check=10)
+    # Get available cameras (blocking device probes, so off the event loop)
+    available_cameras = await asyncio.get_running_loop().run_in_executor(
+        None, get_available_cameras, 10)
 
     # Check current camera status
     camera_status = "Not initialized"
     camera_properties = {}
     last_frame_status = "Unknown"
 
-    if camera is not None:
-        if camera.isOpened():
+    cam = camera
+    if cam is not None:
+        if await camera_call(cam.isOpened):
             camera_status = "Initialized and opened"
 
-            # Get camera properties
-            properties = {
-                "width": camera.get(cv2.CAP_PROP_FRAME_WIDTH),
-                "height": camera.get(cv2.CAP_PROP_FRAME_HEIGHT),
-                "fps": camera.get(cv2.CAP_PROP_FPS),
-                "brightness": camera.get(cv2.CAP_PROP_BRIGHTNESS),
-                "contrast": camera.get(cv2.CAP_PROP_CONTRAST),
-                "saturation": camera.get(cv2.CAP_PROP_SATURATION),
-                "hue": camera.get(cv2.CAP_PROP_HUE),
-                "gain": camera.get(cv2.CAP_PROP_GAIN),
-                "exposure": camera.get(cv2.CAP_PROP_EXPOSURE),
-                "backend": camera.getBackendName()
-            }
-            camera_properties = {k: float(v) for k, v in properties.items() if v is not None}
+            # Get camera properties; each get() is a driver round-trip, so
+            # they are fetched off the event loop and cached
+            fetched_at, properties = _PROPS_CACHE
+            if properties is None or time.monotonic() - fetched_at > PROPS_CACHE_TTL:
+                properties = await camera_call(_fetch_all_props, cam)
+                _PROPS_CACHE = (time.monotonic(), properties)
+            camera_properties = properties
 
             # Try to read a test frame
-            success, _ = camera.read()
+            success, _ = await camera_call(cam.read)
             if success:
                 last_frame_status = "Success"
             else:
@@ -508,14 +788,18 @@ async def camera_errors():
                 "errors": []
             })
 
-        # Read the last 50 lines from the log file
-        with open(CAMERA_CONFIG['error_log_file'], 'r') as f:
-            # Read all lines and get the last 50
-            lines = f.readlines()
-            recent_errors = lines[-50:] if len(lines) > 50 else lines
+        # Read the last 50 lines from the log file. Only the tail block is read,
+        # so this doesn't get slower as the log grows.
+        size = os.path.getsize(CAMERA_CONFIG['error_log_file'])
+        with open(CAMERA_CONFIG['error_log_file'], 'rb') as f:
+            f.seek(max(0, size - 64 * 1024))
+            lines = f.read().decode('utf-8', errors='replace').split('\n')
+            if size > 64 * 1024:
+                # The first line is probably cut off part-way
+                lines = lines[1:]
 
             # Clean up the lines (remove newlines, etc.)
-            recent_errors = [line.strip() for line in recent_errors]
+            recent_errors = [line.strip() for line in lines if line.strip()][-50:]
 
         return jsonify({
             "status": "success",
@@ -579,29 +863,31 @@ async def reset_camera():
     Returns:
         JSON: Status of the camera reset operation.
     """
-    global camera
+    global camera, _PROPS_CACHE
 
     # Release the current camera if it exists
     if camera is not None:
         try:
             print("Forcibly releasing camera...")
-            camera.release()
+            await camera_call(camera.release)
         except Exception as e:
             print(f"Error releasing camera: {e}")
 
     # Set camera to None to ensure clean state
     camera = None
+    _PROPS_CACHE = (0.0, None)
 
     # Wait a moment to ensure resources are freed
     await asyncio.sleep(1)
 
     # Reinitialize the camera
     print("Forcibly reinitializing camera...")
-    camera = initialize_camera()
+    camera = await initialize_camera_async()
 
-    if camera is not None and camera.isOpened():
+    # initialize_camera_async() only returns a camera that opened and read a frame
+    if camera is not None:
         # Try to read a test frame
-        success, _ = camera.read()
+        success, _ = await camera_call(camera.read)
         if success:
             return jsonify({
                 "status": "success",
@@ -618,232 +904,269 @@ async def reset_camera():
             "message": "Failed to reset camera"
         })
 
-@app.route('/video_feed')
-async def video_feed():
+def _publish(jpeg_bytes):
+    """Hands a JPEG to every waiting /video_feed viewer."""
+    global LATEST_FRAME
+    LATEST_FRAME = jpeg_bytes
+    FRAME_READY.set()
+    FRAME_READY.clear()
+
+def _capture_latest(cam, current_interval):
     """
-    Streams video from the webcam.
+    Drain the frames the driver queued since the last capture and decode only
+    the newest. Runs in JPEG_POOL: grab() blocks until the camera delivers.
 
-    This endpoint returns a multipart response with JPEG frames from the webcam.
-    The video stream can be embedded in HTML img tags or used as a background.
+    grab() doesn't decode; a grab that has to wait for the camera means the
+    queue is empty.
 
     Returns:
-        Response: A streaming response with JPEG frames from the webcam.
+        tuple: (opened, success, frame); opened is False if cam is None or closed
     """
-    global camera
-
-    # Create a fallback frame for when camera is unavailable
-    fallback_frame = np.zeros((480, 640, 3), dtype=np.uint8)  # Black frame
-    cv2.putText(fallback_frame, "Camera Unavailable", (120, 240), cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-    _, fallback_buffer = cv2.imencode('.jpg', fallback_frame)
-    fallback_bytes = fallback_buffer.tobytes()
+    if cam is None:
+        return False, False, None
+    with CAMERA_LOCK:
+        # Checked under the lock: a handler may have released cam since the
+        # producer picked it up
+        if not cam.isOpened():
+            return False, False, None
+        frame_period = 1.0 / (cam.get(cv2.CAP_PROP_FPS) or 30.0)
+        max_drain = max(1, min(4, int(current_interval / frame_period)))
+        grabbed = 0
+        for _ in range(max_drain):
+            grab_start = time.perf_counter()
+            if not cam.grab():
+                break
+            grabbed += 1
+            if time.perf_counter() - grab_start > frame_period / 2:
+                break
+        if not grabbed:
+            return True, False, None
+        success, frame = cam.retrieve()
+        return True, success, frame
+
+async def camera_producer():
+    """
+    Captures and encodes frames from the webcam for all /video_feed viewers.
 
-    # Create a heartbeat frame to keep the connection alive
-    heartbeat_frame = np.zeros((8, 8, 3), dtype=np.uint8)  # Tiny black frame for heartbeat
-    _, heartbeat_buffer = cv2.imencode('.jpg', heartbeat_frame, [cv2.IMWRITE_JPEG_QUALITY, 30])
-    heartbeat_bytes = heartbeat_buffer.tobytes()
+    Runs as a single background task, so N viewers cost one decode and one
+    encode per frame instead of N. Its camera calls run in JPEG_POOL under
+    CAMERA_LOCK, like every other handler's.
+    Failed reads publish the fallback frame and, after MAX_FAILURES in a row,
+    reset the camera.
+    """
+    global camera, LATEST_RAW_FRAME, LATEST_RAW_TIME
 
     # Configuration parameters
     MAX_FAILURES = 5  # Maximum consecutive failures before resetting camera
     MIN_FRAME_INTERVAL = 0.1  # Minimum time between frames (10 FPS max)
     MAX_FRAME_INTERVAL = 0.5  # Maximum time between frames (2 FPS min)
-    HEARTBEAT_INTERVAL = 2.0  # Send a heartbeat every 2 seconds if no frames
 
     # Initialize tracking variables
     consecutive_failures = 0
-    last_frame_time = 0
-    last_heartbeat_time = 0
     current_interval = MIN_FRAME_INTERVAL
 
-    # Check if camera is None (not initialized) and try to initialize it
-    if camera is None:
-        print("Camera not initialized, attempting to initialize now...")
-        # Use the robust initialization function
-        camera = initialize_camera()
-        if camera is None:
-            print("Failed to initialize camera on demand using all available methods")
-            # We'll continue with the fallback frame
+    # Set initial timestamp
+    last_frame_time = time.time()
 
-    async def generate():
-        nonlocal consecutive_failures, last_frame_time, last_heartbeat_time, current_interval
-        global camera
+    while True:
+        try:
+            # Nobody is watching: leave the camera alone
+            if VIEWERS == 0:
+                await asyncio.sleep(0.1)
+                continue
+
+            # Sleep until the next frame is due; the capture below drains
+            # whatever the driver queued in the meantime
+            wait = current_interval - (time.time() - last_frame_time)
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+
+            # Update last frame time
+            last_frame_time = time.time()
+
+            # grab() waits on the driver for up to a frame period, so the
+            # drain, the retrieve and the isOpened() check all run together
+            # in the pool rather than on the event loop
+            try:
+                opened, success, frame = await asyncio.get_running_loop().run_in_executor(
+                    JPEG_POOL, _capture_latest, camera, current_interval)
+            except Exception as e:
+                logger.warning("Error during frame capture: %s", e)
+                _publish(FALLBACK_JPEG)
 
-        # Set initial timestamps
-        last_frame_time = time.time()
-        last_heartbeat_time = time.time()
+                # Increase frame interval to reduce load
+                current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
+                continue
 
-        while True:
-            try:
-                current_time = time.time()
-
-                # Check if it's time to send a heartbeat to keep the connection alive
-                if current_time - last_heartbeat_time >= HEARTBEAT_INTERVAL:
-                    print(f"Sending heartbeat to keep connection alive")
-                    last_heartbeat_time = current_time
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + heartbeat_bytes + b'\r\n')
-
-                # Check if enough time has passed to send a new frame
-                if current_time - last_frame_time < current_interval:
-                    # Not time for a new frame yet, sleep a bit and continue
-                    await asyncio.sleep(0.01)  # Short sleep to prevent CPU spinning
-                    continue
+            # Check if camera is None or not opened
+            if not opened:
+                logger.warning("Camera not available, attempting to initialize/reopen...")
 
-                # Update last frame time
-                last_frame_time = current_time
+                # If camera exists, try to release it first
+                if camera is not None:
+                    try:
+                        await camera_call(camera.release)
+                    except Exception as e:
+                        logger.warning("Error releasing camera: %s", e)
 
-                # Check if camera is None or not opened
-                if camera is None or not camera.isOpened():
-                    print(f"Camera not available, attempting to initialize/reopen...")
+                # Set camera to None to ensure clean state
+                camera = None
 
-                    # If camera exists, try to release it first
-                    if camera is not None:
-                        try:
-                            camera.release()
-                        except Exception as e:
-                            print(f"Error releasing camera: {e}")
+                # Wait before reopening
+                await asyncio.sleep(1)
 
-                    # Set camera to None to ensure clean state
-                    camera = None
+                # Try to initialize/reopen the camera using the robust initialization function
+                logger.info("Attempting to reinitialize camera...")
+                camera = await initialize_camera_async()
 
-                    # Wait before reopening
-                    await asyncio.sleep(1)
+                # initialize_camera_async() only returns a camera that opened and read a frame
+                if camera is not None:
+                    logger.info("Successfully reinitialized camera")
+                    # Reset failure counter on successful initialization
+                    consecutive_failures = 0
+                    # Reset frame interval to default
+                    current_interval = MIN_FRAME_INTERVAL
+                else:
+                    logger.warning("Failed to reinitialize camera using all available methods")
+                    camera = None
 
-                    # Try to initialize/reopen the camera using the robust initialization function
-                    print("Attempting to reinitialize camera...")
-                    camera = initialize_camera()
+                # Use fallback frame regardless of initialization result
+                # This ensures the stream continues even if camera init failed
+                _publish(FALLBACK_JPEG)
+                continue
 
-                    if camera is not None and camera.isOpened():
-                        print("Successfully reinitialized camera")
-                        # Reset failure counter on successful initialization
-                        consecutive_failures = 0
-                        # Reset frame interval to default
-                        current_interval = MIN_FRAME_INTERVAL
-                    else:
-                        print("Failed to reinitialize camera using all available methods")
-                        camera = None
+            try:
+                if not success or frame is None:
+                    consecutive_failures += 1
+                    logger.debug("Failed to read frame: %d/%d", consecutive_failures, MAX_FAILURES)
 
-                    # Use fallback frame regardless of initialization result
-                    # This ensures the stream continues even if camera init failed
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
-                    continue
+                    # Increase frame interval to reduce load on system
+                    current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
+                    logger.debug("Increasing frame interval to %.2fs", current_interval)
 
-                # Try to read a frame with timeout protection
-                frame = None
-                success = False
+                    if consecutive_failures >= MAX_FAILURES:
+                        logger.warning("Too many consecutive failures, attempting to reset camera...")
 
-                try:
-                    # Read frame from camera
-                    success, frame = camera.read()
-
-                    if not success or frame is None:
-                        consecutive_failures += 1
-                        print(f"Failed to read frame: {consecutive_failures}/{MAX_FAILURES}")
-
-                        # Increase frame interval to reduce load on system
-                        current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
-                        print(f"Increasing frame interval to {current_interval:.2f}s")
-
-                        if consecutive_failures >= MAX_FAILURES:
-                            print("Too many consecutive failures, attempting to reset camera...")
-
-                            # Try to release the camera
-                            try:
-                                if camera is not None:
-                                    camera.release()
-                                    camera = None
-                            except Exception as e:
-                                print(f"Error releasing camera during reset: {e}")
+                        # Try to release the camera
+                        try:
+                            if camera is not None:
+                                await camera_call(camera.release)
                                 camera = None
+                        except Exception as e:
+                            logger.warning("Error releasing camera during reset: %s", e)
+                            camera = None
 
-                            await asyncio.sleep(1)
-
-                            # Try to reinitialize the camera using the robust initialization function
-                            print("Attempting to reinitialize camera after consecutive failures...")
-                            camera = initialize_camera()
-
-                            if camera is not None and camera.isOpened():
-                                print("Successfully reset camera")
-                                # Read a test frame to verify camera is working
-                                test_success, _ = camera.read()
-                                if test_success:
-                                    print("Camera reset confirmed with successful frame read")
-                                else:
-                                    print("Camera reset succeeded but test frame read failed")
-                                    # If test frame read fails, try to release and reinitialize again
-                                    try:
-                                        camera.release()
-                                    except Exception as e:
-                                        print(f"Error releasing camera after failed test frame: {e}")
-                                    camera = None
-                            else:
-                                print("Failed to reset camera using all available methods")
-                                camera = None
+                        await asyncio.sleep(1)
 
-                            # Reset failure counter after reset attempt
-                            consecutive_failures = 0
+                        # Try to reinitialize the camera using the robust initialization function
+                        logger.info("Attempting to reinitialize camera after consecutive failures...")
+                        camera = await initialize_camera_async()
 
-                        # Use fallback frame when frame read fails
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
-                        continue
+                        if camera is not None:
+                            logger.info("Successfully reset camera")
+                            # Read a test frame to verify camera is working
+                            test_success, _ = await camera_call(camera.read)
+                            if test_success:
+                                logger.info("Camera reset confirmed with successful frame read")
+                            else:
+                                logger.warning("Camera reset succeeded but test frame read failed")
+                                # If test frame read fails, try to release and reinitialize again
+                                try:
+                                    await camera_call(camera.release)
+                                except Exception as e:
+                                    logger.warning("Error releasing camera after failed test frame: %s", e)
+                                camera = None
+                        else:
+                            logger.warning("Failed to reset camera using all available methods")
+                            camera = None
 
-                    # Reset failure counter and adjust frame interval on success
-                    if consecutive_failures > 0:
-                        print(f"Successfully read frame after {consecutive_failures} failures")
+                        # Reset failure counter after reset attempt
                         consecutive_failures = 0
 
-                    # Gradually decrease frame interval on success (increase FPS)
-                    if current_interval > MIN_FRAME_INTERVAL:
-                        current_interval = max(current_interval * 0.9, MIN_FRAME_INTERVAL)
+                    # Use fallback frame when frame read fails
+                    _publish(FALLBACK_JPEG)
+                    continue
 
-                    # Encode the frame as JPEG
-                    try:
-                        # Determine quality based on current performance
-                        quality = 70  # Default quality
-                        if current_interval > MIN_FRAME_INTERVAL * 2:
-                            # If we're struggling, reduce quality
-                            quality = 50
-
-                        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
-                        if not ret:
-                            print("Failed to encode frame")
-                            yield (b'--frame\r\n'
-                                   b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
-                        else:
-                            frame_bytes = buffer.tobytes()
+                # retrieve() returns a new array per frame, so no copy is needed
+                LATEST_RAW_FRAME = frame
+                LATEST_RAW_TIME = time.monotonic()
 
-                            # Update heartbeat time when sending a real frame
-                            last_heartbeat_time = time.time()
+                # Reset failure counter and adjust frame interval on success
+                if consecutive_failures > 0:
+                    logger.debug("Successfully read frame after %d failures", consecutive_failures)
+                    consecutive_failures = 0
 
-                            # Yield the frame in the multipart response format
-                            yield (b'--frame\r\n'
-                                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-                    except Exception as e:
-                        print(f"Error encoding frame: {e}")
-                        yield (b'--frame\r\n'
-                               b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
+                # Gradually decrease frame interval on success (increase FPS)
+                if current_interval > MIN_FRAME_INTERVAL:
+                    current_interval = max(current_interval * 0.9, MIN_FRAME_INTERVAL)
 
+                # Encode the frame as JPEG
+                try:
+                    # Determine quality based on current performance
+                    params = JPEG_PARAMS_NORMAL  # Default quality
+                    if current_interval > MIN_FRAME_INTERVAL * 2:
+                        # If we're struggling, reduce quality
+                        params = JPEG_PARAMS_LOW
+
+                    jpeg = await asyncio.get_running_loop().run_in_executor(
+                        JPEG_POOL, encode_jpeg, frame, params)
+                    if jpeg is None:
+                        logger.warning("Failed to encode frame")
+                        _publish(FALLBACK_JPEG)
+                    else:
+                        _publish(jpeg)
                 except Exception as e:
-                    print(f"Error during frame capture: {e}")
-                    yield (b'--frame\r\n'
-                           b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
+                    logger.warning("Error encoding frame: %s", e)
+                    _publish(FALLBACK_JPEG)
 
-                    # Increase frame interval to reduce load
-                    current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
+            except Exception as e:
+                logger.warning("Error while handling frame: %s", e)
+                _publish(FALLBACK_JPEG)
 
-                # Explicitly delete frame to help with memory management
-                if frame is not None:
-                    del frame
+                # Increase frame interval to reduce load
+                current_interval = min(current_interval * 1.5, MAX_FRAME_INTERVAL)
 
-            except Exception as e:
-                print(f"Critical error in video stream: {e}")
-                # Use fallback frame for any unhandled exceptions
-                yield (b'--frame\r\n'
-                       b'Content-Type: image/jpeg\r\n\r\n' + fallback_bytes + b'\r\n')
+        except Exception as e:
+            logger.error("Critical error in camera producer: %s", e)
+            # Use fallback frame for any unhandled exceptions
+            _publish(FALLBACK_JPEG)
+
+            # Sleep longer after errors to give system time to recover
+            await asyncio.sleep(0.5)
+
+@app.route('/video_feed')
+async def video_feed():
+    """
+    Streams video from the webcam.
 
-                # Sleep longer after errors to give system time to recover
-                await asyncio.sleep(0.5)
+    This endpoint returns a multipart response with JPEG frames from the webcam.
+    The video stream can be embedded in HTML img tags or used as a background.
+    Frames come from the shared camera_producer() task.
+
+    Returns:
+        Response: A streaming response with JPEG frames from the webcam.
+    """
+    async def generate():
+        global VIEWERS
+        VIEWERS += 1
+        try:
+            # Start with something on screen until the first frame arrives
+            yield FALLBACK_MULTIPART
+            while True:
+                try:
+                    await asyncio.wait_for(FRAME_READY.wait(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    # No frame for a while; keep the connection alive
+                    yield HEARTBEAT_MULTIPART
+                    continue
+                # The parts go out as separate chunks so the JPEG isn't copied
+                # into a new bytes object just to add the framing
+                yield FRAME_HEADER
+                yield LATEST_FRAME
+                yield FRAME_TRAILER
+        finally:
+            VIEWERS -= 1
 
     # Set response headers to help prevent the ERR_INCOMPLETE_CHUNKED_ENCODING error
     headers = {
@@ -885,6 +1208,11 @@ async def setup_camera():
     else:
         print("Camera successfully initialized during startup.")
 
+@app.before_serving
+async def start_camera_producer():
+    global _producer_task
+    _producer_task = asyncio.create_task(camera_producer())
+
 @app.before_serving
 async def announce_ip_address():
     s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
@@ -905,11 +1233,14 @@ async def cleanup():
     global camera
     print("Shutting down Fan Turret application...")
 
+    if _producer_task is not None:
+        _producer_task.cancel()
+
     # Release the camera if it exists and is open
     try:
-        if camera is not None and camera.isOpened():
+        if camera is not None:
             print("Releasing camera resources...")
-            camera.release()
+            await camera_call(camera.release)
             print("Camera released successfully")
     except Exception as e:
         print(f"Error releasing camera: {e}")
@@ -917,7 +1248,15 @@ async def cleanup():
     # Set camera to None to ensure it's properly garbage collected
     camera = None
 
+    JPEG_POOL.shutdown(wait=False)
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000)
+    if _HAS_UVLOOP:
+        # uvloop.install() is deprecated from Python 3.12: serve on a loop
+        # uvloop.run creates, rather than the one app.run would make
+        print("Using uvloop event loop")
+        uvloop.run(app.run_task(host="0.0.0.0", port=5000))
+    else:
+        app.run(host="0.0.0.0", port=5000)
 
 
@@ -1,6 +1,29 @@
 import gpiozero as GPIO
+import math
+from contextlib import contextmanager
+import os
 import time
 
+try:
+    import pigpio
+    from gpiozero.pins.pigpio import PiGPIOFactory
+    _HAS_PIGPIO = True
+except Exception:
+    # pigpiod not installed: TurnStep falls back to toggling STEP from Python
+    pigpio = None
+    PiGPIOFactory = None
+    _HAS_PIGPIO = False
+
+# pigpio caps a single waveform at 12000 pulses; each step is two pulses
+WAVE_MAX_STEPS = 5000
+
+# Built waveforms kept for reuse, keyed by STEP mask and step profile
+WAVE_CACHE_MAX = 8
+_wave_cache = {}
+
+# GPIOs routed to the BCM PWM peripheral (PWM0: 12/18, PWM1: 13/19)
+HW_PWM_PINS = (12, 13, 18, 19)
+
 MotorDir = [
     'forward',
     'backward',
@@ -11,6 +34,70 @@ ControlMode = [
     'softward',
 ]
 
+# Opt-in: set STEP_CPU=3 (and boot with isolcpus=3) to pin the software step
+# loop to that core at SCHED_FIFO; unset, it runs as an ordinary thread
+STEP_CPU = os.getenv("STEP_CPU")
+STEP_RT_PRIORITY = 80
+
+# The software step loop sleeps until this close to each edge, then spins
+SPIN_NS = 100_000
+
+_factory = None
+
+def _get_factory():
+    """Shared gpiozero pin factory on pigpiod, or None when it isn't reachable."""
+    global _factory
+    if _factory is None and _HAS_PIGPIO:
+        try:
+            _factory = PiGPIOFactory()
+        except Exception:
+            pass
+    return _factory
+
+def _get_pi():
+    # The factory's own connection, so waveforms and LED writes share one socket
+    factory = _get_factory()
+    return factory.connection if factory is not None else None
+
+def _realtime_on():
+    """
+    Pin the calling thread to STEP_CPU and raise it to SCHED_FIFO so the kernel
+    can't preempt it mid-pulse. Needs root; otherwise falls back to nice -20,
+    and if that fails too the loop simply runs at normal priority.
+    Does nothing unless STEP_CPU is set.
+    Returns the saved state for _realtime_off.
+    """
+    saved = {}
+    if STEP_CPU is None:
+        return saved
+    try:
+        saved['affinity'] = os.sched_getaffinity(0)
+        os.sched_setaffinity(0, {int(STEP_CPU)})
+    except (AttributeError, OSError, ValueError):
+        saved.pop('affinity', None)
+    try:
+        saved['sched'] = (os.sched_getscheduler(0), os.sched_getparam(0))
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(STEP_RT_PRIORITY))
+    except (AttributeError, OSError):
+        saved.pop('sched', None)
+        try:
+            saved['nice'] = os.getpriority(os.PRIO_PROCESS, 0)
+            os.setpriority(os.PRIO_PROCESS, 0, -20)
+        except (AttributeError, OSError):
+            saved.pop('nice', None)
+    return saved
+
+def _realtime_off(saved):
+    try:
+        if 'sched' in saved:
+            os.sched_setscheduler(0, *saved['sched'])
+        if 'nice' in saved:
+            os.setpriority(os.PRIO_PROCESS, 0, saved['nice'])
+        if 'affinity' in saved:
+            os.sched_setaffinity(0, saved['affinity'])
+    except OSError:
+        pass
+
 class DRV8825():
     def __init__(self, dir_pin, step_pin, enable_pin, mode_pins):
 
@@ -19,13 +106,16 @@ class DRV8825():
         self.dir_pin = dir_pin
         self.enable_pin = enable_pin
         self.step_pin = step_pin
+        self.pi = _get_pi()
+        # With pigpiod up, gpiozero writes through it too instead of RPi.GPIO
+        factory = _get_factory()
         
-        self.dir = GPIO.LED(self.dir_pin)
-        self.step = GPIO.LED(self.step_pin)        
-        self.enable = GPIO.LED(self.enable_pin)
-        self.mode_1 = GPIO.LED(self.mode_pins[0])
-        self.mode_2 = GPIO.LED(self.mode_pins[1])
-        self.mode_3 = GPIO.LED(self.mode_pins[2])
+        self.dir = GPIO.LED(self.dir_pin, pin_factory=factory)
+        self.step = GPIO.LED(self.step_pin, pin_factory=factory)
+        self.enable = GPIO.LED(self.enable_pin, pin_factory=factory)
+        self.mode_1 = GPIO.LED(self.mode_pins[0], pin_factory=factory)
+        self.mode_2 = GPIO.LED(self.mode_pins[1], pin_factory=factory)
+        self.mode_3 = GPIO.LED(self.mode_pins[2], pin_factory=factory)
         
         #GPIO.setmode(GPIO.BCM)
         #GPIO.setwarnings(False)
@@ -41,6 +131,13 @@ class DRV8825():
           mode_pins[1]: self.mode_2,
           mode_pins[2]: self.mode_3
         }
+
+        if self.pi is not None:
+            # Drive every control pin low in a single bank write
+            pins = (dir_pin, step_pin, enable_pin, *mode_pins)
+            for pin in pins:
+                self.pi.set_mode(pin, pigpio.OUTPUT)
+            self.pi.clear_bank_1(sum(1 << pin for pin in pins))
         
     def digital_write(self, pin, value):
         if value:
@@ -51,9 +148,21 @@ class DRV8825():
         #GPIO.output(pin, value)
         
     def Stop(self):
+        # Same level as Start: on this board EN low is the enabled state, so
+        # the driver keeps holding torque after a Stop
+        self.digital_write(self.enable_pin, 0)
+
+    def Start(self):
         self.digital_write(self.enable_pin, 0)
         
     def Configure_mode(self, microstep):
+        if self.pi is not None:
+            # One clear + one set instead of three separate pin writes
+            set_mask = sum(1 << pin for pin, level in zip(self.mode_pins, microstep) if level)
+            clear_mask = sum(1 << pin for pin, level in zip(self.mode_pins, microstep) if not level)
+            self.pi.clear_bank_1(clear_mask)
+            self.pi.set_bank_1(set_mask)
+            return
         j = 0
         for i in microstep:
           self.digital_write(self.mode_pins[j], i)
@@ -81,26 +190,207 @@ class DRV8825():
             #self.digital_write(self.mode_pins, microstep[stepformat])
             self.Configure_mode(microstep[stepformat])
         
-    def TurnStep(self, Dir, steps, stepdelay=0.005):
+    def TurnStep(self, Dir, steps, stepdelay=0.005, startdelay=None, accel=20000, wait=True):
+        """
+        stepdelay is the half-period at full speed. Pass a longer startdelay to
+        ramp up from that rate at accel steps/s^2 and back down before the end.
+        With wait=False (pigpio only) the call returns once the move is on the
+        wire, and the next move's waveform is built while this one runs.
+        """
+        wids = None
+        if self.pi is not None:
+            if steps > 0 and Dir in MotorDir:
+                wids = _get_waves(self.pi, 1 << self.step_pin, steps, stepdelay, startdelay, accel)
+            # DIR must not change under a move that is still running
+            _wait_tx(self.pi)
+
+        # The driver is enabled once around a sequence (DriversEnabled),
+        # not on every move
         if (Dir == MotorDir[0]):
             print("forward")
-            self.digital_write(self.enable_pin, 0)
             self.digital_write(self.dir_pin, 0)
         elif (Dir == MotorDir[1]):
             print("backward")
-            self.digital_write(self.enable_pin, 0)
             self.digital_write(self.dir_pin, 1)
         else:
             print("the dir must be : 'forward' or 'backward'")
-            self.digital_write(self.enable_pin, 0)
             return
 
         if (steps == 0):
             return
             
         print("turn step:",steps)
-        for i in range(steps):
-            self.digital_write(self.step_pin, True)
-            time.sleep(stepdelay)
-            self.digital_write(self.step_pin, False)
-            time.sleep(stepdelay)
+        if self.pi is not None:
+            _send_waves(self.pi, wids, wait)
+        else:
+            _soft_pulses((self.step,), _step_profile(steps, stepdelay, startdelay, accel))
+
+    def TurnStepPWM(self, Dir, steps, hz=100):
+        """
+        Constant-rate move with the STEP pin driven by the hardware PWM block.
+        The move is timed (steps / hz) rather than counted, so it may be off by
+        a pulse; pins without hardware PWM fall back to TurnStep.
+        """
+        if self.pi is None or self.step_pin not in HW_PWM_PINS or Dir not in MotorDir:
+            return self.TurnStep(Dir, steps, stepdelay=0.5 / hz)
+
+        # steps=0 only sets enable/direction
+        self.TurnStep(Dir, 0)
+        if (steps == 0):
+            return
+
+        print("turn step (pwm):",steps)
+        end_ns = time.monotonic_ns() + steps * 1_000_000_000 // hz
+        self.pi.hardware_PWM(self.step_pin, hz, 500_000)
+        try:
+            remaining_ns = end_ns - time.monotonic_ns()
+            while remaining_ns > 0:
+                time.sleep(remaining_ns / 1e9)
+                remaining_ns = end_ns - time.monotonic_ns()
+        finally:
+            self.pi.hardware_PWM(self.step_pin, 0, 0)
+
+
+@contextmanager
+def DriversEnabled(*motors):
+    """
+    Enable the drivers once for a whole sequence of moves, instead of
+    re-enabling (and re-settling) around every TurnStep. On exit it waits for
+    the last waveform and calls Stop, which leaves the drivers enabled.
+    """
+    for motor in motors:
+        motor.Start()
+    try:
+        yield
+    finally:
+        pi = _get_pi()
+        if pi is not None:
+            _wait_tx(pi)
+        for motor in motors:
+            motor.Stop()
+
+def TurnStepTogether(motors, Dir, steps, stepdelay=0.005, startdelay=None, accel=20000, wait=True):
+    """
+    Step several motors in lockstep. Dir is one direction for all motors or a
+    sequence with one per motor. With pigpio all STEP bits share one waveform,
+    so every edge is a single register write and the motors can't skew.
+    Timing arguments are as for DRV8825.TurnStep.
+    """
+    dirs = [Dir] * len(motors) if isinstance(Dir, str) else list(Dir)
+    if any(d not in MotorDir for d in dirs):
+        print("the dir must be : 'forward' or 'backward'")
+        return
+    pi = _get_pi()
+    wids = None
+    if pi is not None and steps > 0:
+        # Built before TurnStep(d, 0) waits out any move still running
+        wids = _get_waves(pi, sum(1 << m.step_pin for m in motors), steps, stepdelay, startdelay, accel)
+    for motor, d in zip(motors, dirs):
+        motor.TurnStep(d, 0)
+
+    if (steps == 0):
+        return
+
+    print("turn step together:",steps)
+    if pi is not None:
+        _send_waves(pi, wids, wait)
+    else:
+        _soft_pulses([m.step for m in motors], _step_profile(steps, stepdelay, startdelay, accel))
+
+def _step_profile(steps, stepdelay, startdelay=None, accel=20000):
+    """
+    Half-period of every step in microseconds. Without startdelay the rate is
+    constant; otherwise it ramps from 1/(2*startdelay) up to 1/(2*stepdelay)
+    at accel steps/s^2 and mirrors the ramp down to stop at the same rate.
+    """
+    half_us = max(1, int(round(stepdelay * 1_000_000)))
+    if startdelay is None or startdelay <= stepdelay:
+        return [half_us] * steps
+    v0_sq = (0.5 / startdelay) ** 2
+    v_max = 0.5 / stepdelay
+    profile = []
+    for i in range(steps):
+        v = min(v_max, math.sqrt(v0_sq + 2.0 * accel * min(i, steps - 1 - i)))
+        profile.append(max(1, int(round(500_000 / v))))
+    return profile
+
+def _get_waves(pi, mask, steps, stepdelay, startdelay, accel):
+    """
+    Wave ids for a move, built once per (mask, profile) and then reused:
+    wave_create allocates DMA control blocks, so repeat moves skip it.
+    """
+    key = (mask, steps, stepdelay, startdelay, accel)
+    wids = _wave_cache.get(key)
+    if wids is None:
+        if len(_wave_cache) >= WAVE_CACHE_MAX:
+            _clear_waves(pi)
+        profile = _step_profile(steps, stepdelay, startdelay, accel)
+        try:
+            wids = _build_waves(pi, mask, profile)
+        except pigpio.error:
+            # Out of DMA control blocks: drop the cached waves and build again
+            _clear_waves(pi)
+            wids = _build_waves(pi, mask, profile)
+        _wave_cache[key] = wids
+    return wids
+
+def _build_waves(pi, mask, profile):
+    wids = []
+    for start in range(0, len(profile), WAVE_MAX_STEPS):
+        pulses = []
+        for half_us in profile[start:start + WAVE_MAX_STEPS]:
+            pulses.append(pigpio.pulse(mask, 0, half_us))
+            pulses.append(pigpio.pulse(0, mask, half_us))
+        pi.wave_add_generic(pulses)
+        wids.append(pi.wave_create())
+    return wids
+
+def _clear_waves(pi):
+    # wave_clear would cut off a move that is still transmitting
+    _wait_tx(pi)
+    pi.wave_clear()
+    _wave_cache.clear()
+
+def _send_waves(pi, wids, wait=True):
+    # DMA clocks the edges. Each chunk is queued behind the one in flight
+    # (ONE_SHOT_SYNC) so long moves have no gap between chunks.
+    for wid in wids:
+        pi.wave_send_using_mode(wid, pigpio.WAVE_MODE_ONE_SHOT_SYNC)
+        while pi.wave_tx_busy() and pi.wave_tx_at() != wid:
+            time.sleep(0.001)
+    if wait:
+        _wait_tx(pi)
+
+def _wait_tx(pi):
+    while pi.wave_tx_busy():
+        time.sleep(0.001)
+
+def _wait_until_ns(deadline_ns):
+    # Sleep through most of the wait, then spin the last SPIN_NS for the edge
+    remaining = deadline_ns - time.perf_counter_ns()
+    if remaining > SPIN_NS:
+        time.sleep((remaining - SPIN_NS) / 1e9)
+    while time.perf_counter_ns() < deadline_ns:
+        pass
+
+def _soft_pulses(leds, profile):
+    # Absolute deadlines, so sleep overshoot doesn't accumulate over the move
+    half_ns_profile = [half_us * 1000 for half_us in profile]
+    # Bind the bound methods once; attribute lookups dominate a loop this tight
+    now = time.perf_counter_ns
+    ons = [led.on for led in leds]
+    offs = [led.off for led in leds]
+    saved = _realtime_on()
+    try:
+        deadline = now()
+        for half_ns in half_ns_profile:
+            for on in ons:
+                on()
+            deadline += half_ns
+            _wait_until_ns(deadline)
+            for off in offs:
+                off()
+            deadline += half_ns
+            _wait_until_ns(deadline)
+    finally:
+        _realtime_off(saved)
@@ -17,6 +17,9 @@ Notes on hardware:
 - For 28BYJ-48 (5V) geared stepper typical full steps per output shaft rev ~2048
   (32 steps/rotor rev * 63.683:1 gear ≈ 2038–4096 depending on half/full stepping).
 - Update STEPPER_CONFIG to match your motors and mechanical ratios.
+- Every step is an I2C write, so the bus clock caps the step rate. The Pi
+  defaults to 100 kHz; the PCA9685 handles 1 MHz. Set fast mode in
+  /boot/config.txt (then reboot):  dtparam=i2c_arm_baudrate=400000
 
 IMPORTANT: For precise motion and acceleration control you may want to replace this
 with Waveshare's official Python examples/library. This adapter aims for simplicity.
@@ -43,6 +46,8 @@ except Exception:
 # Mechanical/electrical configuration per axis
 STEPPER_CONFIG = {
     'i2c_addr': 0x40,       # PCA9685 default I2C address for Waveshare HAT
+    'i2c_bus': 1,           # /dev/i2c-1 on the Pi header
+    'i2c_min_hz': 400000,   # warn at start-up if the bus is clocked slower
     'freq_hz': 1000,        # PCA9685 PWM frequency; we mainly use on/off
 
     # Channels for the 4 coils of each motor (adjust to your hat mapping)
@@ -65,6 +70,10 @@ STEPPER_CONFIG = {
 
     # Step delay (seconds) — tune for smoothness and torque
     'step_delay': 0.0015,
+
+    # A new target within one step sequence of the previous one, arriving within
+    # this many ms of it, doesn't cancel the move in progress (see set_target_deg)
+    'coalesce_ms': 20,
 }
 
 # Half-step sequence (8 steps) for 4-wire unipolar/bipolar via ULN2003-style drivers
@@ -89,6 +98,15 @@ FULL_STEP_SEQ: List[List[int]] = [
 ]
 
 
+def i2c_bus_hz(bus: int) -> int | None:
+    """Clock rate of /dev/i2c-<bus> from the device tree, or None if unknown."""
+    try:
+        with open(f"/sys/class/i2c-adapter/i2c-{bus}/of_node/clock-frequency", "rb") as f:
+            return int.from_bytes(f.read(4), "big")
+    except (OSError, ValueError):
+        return None
+
+
 # ------------------ PCA9685 Minimal Driver ------------------
 class PCA9685:
     MODE1 = 0x00
@@ -99,6 +117,13 @@ class PCA9685:
         self.bus = bus
         self.address = address
         self._init_chip()
+        # The clock is fixed by the device tree at boot, so it can only be reported here
+        hz = i2c_bus_hz(STEPPER_CONFIG['i2c_bus'])
+        if hz is not None:
+            print(f"[StepperHAT] I2C bus {STEPPER_CONFIG['i2c_bus']} at {hz // 1000} kHz")
+            if hz < STEPPER_CONFIG['i2c_min_hz']:
+                print("[StepperHAT] WARNING: slow I2C limits the step rate; set "
+                      f"dtparam=i2c_arm_baudrate={STEPPER_CONFIG['i2c_min_hz']} in /boot/config.txt")
 
     def _write8(self, reg: int, val: int) -> None:
         self.bus.write_byte_data(self.address, reg, val & 0xFF)
@@ -134,36 +159,96 @@ class PCA9685:
         else:
             self.set_pwm(channel, 0, 0)
 
+    @staticmethod
+    def pins_payload(pattern: List[int]) -> List[int]:
+        # LEDn_ON_L, ON_H, OFF_L, OFF_H for each channel: off=4095 (on) or 0
+        buf: List[int] = []
+        for value in pattern:
+            buf += [0, 0, 0xFF, 0x0F] if value else [0, 0, 0, 0]
+        return buf
+
+    def write_pins_block(self, base_channel: int, payload: List[int]) -> None:
+        # Consecutive channels in one I2C transaction: MODE1 auto-increment walks
+        # LEDn_ON_L .. LEDm_OFF_H, instead of 4 single-byte writes per channel
+        self.bus.write_i2c_block_data(self.address, self.LED0_ON_L + 4 * base_channel, payload)
+
+    def set_pins_block(self, base_channel: int, pattern: List[int]) -> None:
+        self.write_pins_block(base_channel, self.pins_payload(pattern))
+
 
 # add near the top
 import threading
-from collections import deque
 
 # ------------------ Stepper Axis ------------------
 class StepperAxis:
     def __init__(self, pca: PCA9685 | None, channels: List[int], steps_per_rev: int, gear_ratio: float, microstep: int, step_delay: float):
         ...
         self.seq = HALF_STEP_SEQ if self.microstep >= 2 else FULL_STEP_SEQ
+        # Coils on consecutive channels can be updated with one block write
+        self._contiguous = channels == list(range(channels[0], channels[0] + len(channels)))
+        # ...whose payload for each sequence entry is built here, once
+        self._frames = None
+        if pca is not None and self._contiguous:
+            self._frames = tuple(PCA9685.pins_payload(p) for p in self.seq)
+        # Adjacent entries differ in one or two coils; _changed[i][j] is the
+        # (first, last + 1) coil span that differs going from entry i to j,
+        # and _last_idx the entry on the coils now (None if unknown)
+        self._changed = tuple(tuple(self._changed_span(a, b) for b in self.seq) for a in self.seq)
+        self._last_idx = None
 
         # --- NEW: async control state ---
-        self._cv = threading.Condition()
-        self._mailbox = deque(maxlen=1)  # holds at most one target deg
-        self._gen = 0                    # generation counter – cancels current move
-        self._stop = False
+        # One producer (set_target_deg) and one consumer (_run), so no lock:
+        # attribute stores are atomic, and the Event wakes the worker
+        self._new_target = None          # latest target deg
+        self._wake = threading.Event()
+        self._gen = 0                    # generation counter – cancels current move; written only by set_target_deg
+        self._stop = False               # set by shutdown(); ends the worker
+        self._last_update_ns = 0         # when set_target_deg was last called
+        self._last_target_step = 0       # ...and the step it asked for (the axis starts at step 0)
         self._worker = threading.Thread(target=self._run, name=f"axis-worker-{id(self)}", daemon=True)
         self._worker.start()
 
     def shutdown(self):
-        with self._cv:
-            self._stop = True
-            self._gen += 1
-            self._cv.notify_all()
+        # _gen is left to set_target_deg, its only writer: _run checks _stop
+        # on every step as well, so this still ends a move in progress
+        self._stop = True
+        self._wake.set()
         # do not join daemon worker on exit
 
+    @staticmethod
+    def _changed_span(a: List[int], b: List[int]):
+        diff = [k for k in range(len(a)) if a[k] != b[k]]
+        return (diff[0], diff[-1] + 1) if diff else (0, 0)
+
     def _energize(self, pattern: List[int]):
-        ...
+        if self.pca is None:
+            return
+        self._last_idx = None
+        if self._contiguous:
+            self.pca.set_pins_block(self.channels[0], pattern)
+        else:
+            for ch, value in zip(self.channels, pattern):
+                self.pca.set_pin(ch, value)
+
+    def _energize_step(self, idx: int):
+        # Hot path for _run: energize self.seq[idx], writing only the coils that
+        # differ from the entry already on them
+        if self.pca is None:
+            return
+        last = self._last_idx
+        lo, hi = (0, len(self.channels)) if last is None else self._changed[last][idx]
+        if self._frames is not None:
+            if lo < hi:
+                self.pca.write_pins_block(self.channels[lo], self._frames[idx][4 * lo:4 * hi])
+        else:
+            pattern = self.seq[idx]
+            for k in range(lo, hi):
+                self.pca.set_pin(self.channels[k], pattern[k])
+        self._last_idx = idx
 
     def _deenergize_all(self):
+        # The coils no longer hold a sequence entry: the next step writes all of them
+        self._last_idx = None
         ...
 
     def steps_per_deg(self) -> float:
@@ -172,23 +257,36 @@ class StepperAxis:
     # --- NEW: non-blocking setter that cancels current move and replaces queue ---
     def set_target_deg(self, target_deg: float):
         target_deg = max(STEPPER_CONFIG['min_deg'], min(STEPPER_CONFIG['max_deg'], float(target_deg)))
-        with self._cv:
-            self._mailbox.clear()
-            self._mailbox.append(target_deg)
+        target_step = int(round(target_deg * self.steps_per_deg()))
+        if target_step == self._last_target_step:
+            # Rounds to the step already being headed for: nothing to restart
+            return
+        now = time.perf_counter_ns()
+        # Target before generation: _run reads them in the opposite order, so
+        # it never runs a stale target under the new generation
+        self._new_target = target_deg
+        # A stream of small corrections would otherwise abort every move
+        # after a step or two; close to the last target, let the current
+        # move finish and the worker picks this one up after it
+        coalesce = (now - self._last_update_ns < STEPPER_CONFIG['coalesce_ms'] * 1_000_000
+                    and abs(target_step - self._last_target_step) < len(self.seq))
+        if not coalesce:
             self._gen += 1  # invalidate any in-flight loop
-            self._cv.notify_all()
+        self._last_update_ns = now
+        self._last_target_step = target_step
+        self._wake.set()
 
     # --- NEW: worker loop; always heads toward the latest target, dropping stale ones ---
     def _run(self):
         seq_len = len(self.seq)
         while True:
-            with self._cv:
-                while not self._mailbox and not self._stop:
-                    self._cv.wait()
-                if self._stop:
-                    return
-                target_deg = self._mailbox[-1]   # only care about newest
-                my_gen = self._gen
+            self._wake.wait()
+            # Clear before reading, so a target set from here on wakes us again
+            self._wake.clear()
+            if self._stop:
+                return
+            my_gen = self._gen
+            target_deg = self._new_target   # only care about newest
 
             # step toward target, checking for cancellation each micro-step
             spd = self.steps_per_deg()
@@ -202,19 +300,35 @@ class StepperAxis:
                 self.current_deg = target_deg
                 continue
 
-            idx = self.current_step % seq_len
+            # Hot names bound to locals; current_step is written back after the move
+            energize_step = self._energize_step
+            perf_counter, sleep = time.perf_counter, time.sleep
+            delay = self.step_delay
+            current_step = self.current_step
+            idx = current_step % seq_len
+            # Steps are paced against a schedule rather than by sleeping
+            # step_delay after each one, so the I2C write time isn't added
+            # to every step period
+            next_step = perf_counter()
             for _ in range(steps):
-                # cancelled/newer command?
-                with self._cv:
-                    if my_gen != self._gen or self._stop:
-                        break
+                # cancelled/newer command? Plain attribute reads are atomic
+                if my_gen != self._gen or self._stop:
+                    break
                 idx = (idx + step_dir) % seq_len
-                self._energize(self.seq[idx])
-                time.sleep(self.step_delay)
-                self.current_step += step_dir
+                energize_step(idx)
+                current_step += step_dir
+                next_step += delay
+                remaining = next_step - perf_counter()
+                if remaining > 0:
+                    sleep(remaining)
+                elif remaining < -delay:
+                    # Fell more than a step behind (bus stall): resync rather
+                    # than bursting steps the motor can't follow
+                    next_step = perf_counter()
 
             # snap and record final position for this generation
-            self.current_deg = self.current_step / spd
+            self.current_step = current_step
+            self.current_deg = current_step / spd
             # optional: de-energise to reduce heat
             # self._deenergize_all()
 
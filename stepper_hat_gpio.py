@@ -20,7 +20,7 @@ Notes:
 
 from __future__ import annotations
 import threading, time, atexit
-from typing import Tuple
+from typing import Optional, Tuple
 
 try:
     import RPi.GPIO as GPIO
@@ -59,6 +59,7 @@ MAX_HZ        = 400               # max step frequency (steps/s)
 START_HZ      = 80                # initial step rate from standstill
 ACCEL_SPS2    = 800               # acceleration (steps/s^2)
 JOG_SLEEP     = 0.001             # idle loop sleep
+SPIN_NS       = 100_000           # busy-wait the last 0.1 ms before each step edge
 
 # Travel limits
 MIN_DEG, MAX_DEG = -90.0, 90.0
@@ -74,8 +75,8 @@ def _safe_gpio_setup():
 def _pins_setup(dir_pin:int, step_pin:int, en_pin:int, mode_pins:Tuple[int,int,int]):
     if not _HAS_GPIO:
         return
-    for p in (dir_pin, step_pin, en_pin, *mode_pins):
-        GPIO.setup(p, GPIO.OUT, initial=GPIO.LOW)
+    # RPi.GPIO takes a pin list: one call instead of one per pin
+    GPIO.setup([dir_pin, step_pin, en_pin, *mode_pins], GPIO.OUT, initial=GPIO.LOW)
     # Set microstep bits (safe even if DIP overrides)
     m = _MICRO_TABLE.get(MICROSTEP.upper(), (0,0,0))
     GPIO.output(mode_pins, m)
@@ -93,12 +94,25 @@ def _set_enable(en_pin:int, run:bool):
     level = GPIO.HIGH if (run == ACTIVE_HIGH_ENABLE) else GPIO.LOW
     GPIO.output(en_pin, level)
 
-def _pulse_step(step_pin:int, half_period:float):
-    if not _HAS_GPIO:
-        time.sleep(half_period*2)
-        return
-    GPIO.output(step_pin, GPIO.HIGH); time.sleep(half_period)
-    GPIO.output(step_pin, GPIO.LOW);  time.sleep(half_period)
+def _wait_until_ns(deadline_ns:int):
+    # time.sleep() overshoots by 50 µs or more: sleep until just before the
+    # deadline, then spin on perf_counter_ns() for the rest
+    remaining = deadline_ns - time.perf_counter_ns()
+    if remaining > SPIN_NS:
+        time.sleep((remaining - SPIN_NS) / 1e9)
+    while time.perf_counter_ns() < deadline_ns:
+        pass
+
+def _pulse_step(step_pin:int, edge_ns:int, period_ns:int):
+    # Rising edge at edge_ns, falling edge half a period later; returns at
+    # edge_ns + period_ns, the next step's edge
+    _wait_until_ns(edge_ns)
+    if _HAS_GPIO:
+        GPIO.output(step_pin, GPIO.HIGH)
+    _wait_until_ns(edge_ns + period_ns // 2)
+    if _HAS_GPIO:
+        GPIO.output(step_pin, GPIO.LOW)
+    _wait_until_ns(edge_ns + period_ns)
 
 class _AxisRunner(threading.Thread):
     def __init__(self, name:str, dir_pin:int, step_pin:int, en_pin:int, mode_pins:Tuple[int,int,int], deg_to_steps:float):
@@ -119,6 +133,7 @@ class _AxisRunner(threading.Thread):
 
     def run(self):
         cur_hz = 0.0
+        next_edge_ns = None  # step edges follow one schedule so sleep error doesn't accumulate
         while not self._stop.is_set():
             with self._lock:
                 delta = self._target_steps - self._pos_steps
@@ -138,13 +153,19 @@ class _AxisRunner(threading.Thread):
                     cur_hz = max(START_HZ, cur_hz - ACCEL_SPS2 * 0.002)
                 # Bound
                 cur_hz = max(START_HZ, min(MAX_HZ, cur_hz))
-                half = 1.0 / (cur_hz * 2.0)
+                period_ns = int(1e9 / cur_hz)
+                now_ns = time.perf_counter_ns()
+                if next_edge_ns is None or now_ns - next_edge_ns > period_ns:
+                    # Starting from rest, or fell more than a step behind: resync
+                    next_edge_ns = now_ns
                 # Step once
-                _pulse_step(self.step_pin, half)
+                _pulse_step(self.step_pin, next_edge_ns, period_ns)
+                next_edge_ns += period_ns
                 self._pos_steps += direction
                 self._last_motion_t = time.time()
             else:
                 # No motion
+                next_edge_ns = None
                 if not HOLD_ENABLE_WHEN_IDLE:
                     if time.time() - self._last_motion_t > IDLE_DISABLE_AFTER_S:
                         _set_enable(self.en_pin, False)
@@ -187,6 +208,16 @@ class _ControllerGPIO:
             return
         self._tilt_axis.set_target_deg(angle_deg)
 
+    def move(self, pan: Optional[float] = None, tilt: Optional[float] = None):
+        # pan and tilt in one call; either may be None to leave it as is
+        if self._dummy:
+            print(f"[GPIO controller_gpio] move -> pan {pan}, tilt {tilt}")
+            return
+        if pan is not None:
+            self._pan_axis.set_target_deg(pan)
+        if tilt is not None:
+            self._tilt_axis.set_target_deg(tilt)
+
 def _micro_multiplier():
     # Steps per rev multiplier based on microstepping
     m = MICROSTEP.upper()
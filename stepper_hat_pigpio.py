@@ -4,7 +4,7 @@
 
 from __future__ import annotations
 import math, time, threading, atexit
-from typing import Tuple
+from typing import Optional, Tuple
 
 try:
     import pigpio
@@ -25,9 +25,9 @@ IDLE_DISABLE_AFTER_S = 1.5
 SPEED_SCALE = .1
 FREQ_MIN_HZ = 500
 FREQ_MAX_HZ = 4000
-RAMP_UPDATE_S = 0.002
+RAMP_SEGMENTS = 50  # a move is planned as up to this many constant-frequency segments
+WAVE_LOOP_PULSES = 50  # longer exact-pulse runs repeat a wave of this many pulses
 # FINISH_PULSE_FREQ_HZ is no longer used, as the ramp's final frequency is used instead.
-IDLE_SLEEP_S = 0.01
 
 # HAT pinout (BCM)
 M1_DIR, M1_STEP, M1_EN = 13, 19, 12  # X / pan
@@ -57,6 +57,12 @@ TILT_MIN_DEG = PAN_MIN_DEG
 TILT_MAX_DEG = PAN_MAX_DEG
 
 
+# pigpiod has one pending-pulse buffer and one wave transmitter, shared by both
+# axes; an axis holds this from wave_add_generic until its wave is deleted, and
+# the other axis keeps stepping on hardware PWM meanwhile (see _move_block)
+_WAVE_LOCK = threading.Lock()
+
+
 def clamp(v: float, lo: float, hi: float) -> float:
     return lo if v < lo else hi if v > hi else v
 
@@ -92,50 +98,145 @@ class Axis:
         self._last_motion_t = 0.0
         self._speed_scale = SPEED_SCALE
         self._stop_evt = threading.Event()
+        self._wake = threading.Event()  # set by move_to()/stop(); the idle worker waits on it
         self._thread = threading.Thread(target=self._run, daemon=True)
+        # Bank masks, so several pins change in one pigpiod round trip
+        self._dir_mask = 1 << self.dir_pin
+        self._en_mask = 1 << self.en_pin
         for g in (self.dir_pin, self.step_pin, self.en_pin, *self.mode_pins):
             self.pi.set_mode(g, pigpio.OUTPUT)
         self._apply_microstep(MICROSTEP)
         self._set_enable(False)
+        # Scripts stored in pigpiod, keyed by direction, that set DIR, enable the
+        # driver and start the step PWM (p0 Hz) in one request; None if unavailable
+        self._start_sids = self._store_start_scripts()
         self._thread.start()
 
     def _set_enable(self, en: bool) -> None:
         self.pi.write(self.en_pin, 1 if (en == ACTIVE_HIGH_ENABLE) else 0)
 
+    def _write_bank(self, high: int, low: int) -> None:
+        # Set/clear every pin in the masks with one call each, not one per pin
+        if high: self.pi.set_bank_1(high)
+        if low: self.pi.clear_bank_1(low)
+
     def _apply_microstep(self, mode: str) -> None:
         ms = _MICRO_TABLE.get(mode.upper())
         if not ms: raise ValueError(f"Unknown MICROSTEP '{mode}'")
+        high = low = 0
         for pin, lvl in zip(self.mode_pins, ms):
-            self.pi.write(pin, 1 if lvl else 0)
+            if lvl: high |= 1 << pin
+            else: low |= 1 << pin
+        self._write_bank(high, low)
 
     def _set_dir(self, forward: bool) -> None:
         self.pi.write(self.dir_pin, 1 if forward else 0)
 
+    def _set_dir_and_enable(self, forward: bool) -> None:
+        # _set_dir(forward) and _set_enable(True) together
+        high = low = 0
+        if forward: high |= self._dir_mask
+        else: low |= self._dir_mask
+        if ACTIVE_HIGH_ENABLE: high |= self._en_mask
+        else: low |= self._en_mask
+        self._write_bank(high, low)
+
+    def _store_start_scripts(self):
+        en = 1 if ACTIVE_HIGH_ENABLE else 0
+        sids = {}
+        try:
+            for forward in (True, False):
+                script = f"w {self.dir_pin} {int(forward)} w {self.en_pin} {en} hp {self.step_pin} p0 500000"
+                sids[forward] = self.pi.store_script(script.encode())
+            for sid in sids.values():
+                while self.pi.script_status(sid)[0] == pigpio.PI_SCRIPT_INITING:
+                    time.sleep(0.001)
+        except Exception:
+            self._delete_scripts(sids)
+            return None
+        return sids
+
+    def _delete_scripts(self, sids) -> None:
+        for sid in (sids or {}).values():
+            try:
+                self.pi.delete_script(sid)
+            except Exception:
+                pass
+
+    def _start_motion(self, forward: bool, freq_hz: int) -> None:
+        # _set_dir_and_enable(forward) then _hardware_pwm(freq_hz), in one request
+        if self._start_sids is None:
+            self._set_dir_and_enable(forward)
+            self._hardware_pwm(freq_hz)
+            return
+        self.pi.run_script(self._start_sids[forward], [int(freq_hz)])
+
     def _hardware_pwm(self, freq_hz: int) -> None:
         duty = 500_000 if freq_hz > 0 else 0
         self.pi.hardware_PWM(self.step_pin, int(freq_hz), duty)
 
-    def _emit_exact_pulses(self, count: int, freq_hz: int) -> None:
-        if count <= 0: return
+    def _emit_exact_pulses(self, count: int, freq_hz: int) -> int:
+        """Sends count step pulses at freq_hz; returns how many went out (fewer if stopped).
+
+        The caller holds _WAVE_LOCK.
+        """
+        if count <= 0: return 0
         # Ensure frequency is reasonable to prevent extremely long/short pulses
         freq_hz = clamp(freq_hz, 1, 50000)
         half_us = int(500_000 / freq_hz)
-        pulses = []
-        for _ in range(count):
-            pulses.append(pigpio.pulse(1 << self.step_pin, 0, half_us))
-            pulses.append(pigpio.pulse(0, 1 << self.step_pin, half_us))
-        self.pi.wave_clear()
-        self.pi.wave_add_generic(pulses)
-        wid = self.pi.wave_create()
+        pulse = [pigpio.pulse(1 << self.step_pin, 0, half_us),
+                 pigpio.pulse(0, 1 << self.step_pin, half_us)]
+        # Past WAVE_LOOP_PULSES, one short wave is repeated by a wave_chain
+        # loop rather than building a DMA control block for every pulse
+        reps, rest = divmod(count, WAVE_LOOP_PULSES) if count > WAVE_LOOP_PULSES else (0, count)
+        # No wave_clear(): it would also delete the other axis's waves. Each
+        # call deletes just the waves it created, once they've been sent.
+        wids = []
         try:
-            self.pi.wave_send_once(wid)
-            while self.pi.wave_tx_busy(): time.sleep(0.001)
+            chain = []
+            if reps:
+                self.pi.wave_add_generic(pulse * WAVE_LOOP_PULSES)
+                wids.append(self.pi.wave_create())
+                chain += [255, 0, wids[-1], 255, 1, reps & 0xFF, reps >> 8]
+            if rest:
+                self.pi.wave_add_generic(pulse * rest)
+                wids.append(self.pi.wave_create())
+                chain.append(wids[-1])
+            t_start = time.perf_counter()
+            self.pi.wave_chain(chain)
+            # The wave's length is known: sleep through it on the stop event
+            # rather than polling wave_tx_busy; stop() wakes this early
+            if self._stop_evt.wait(count * 2 * half_us / 1e6):
+                self.pi.wave_tx_stop()
+                return min(count, int((time.perf_counter() - t_start) * freq_hz))
+            while self.pi.wave_tx_busy():  # DMA finishing the last pulse
+                time.sleep(0.0005)
+            return count
         finally:
             if self.pi.connected:
-                self.pi.wave_delete(wid)
+                for wid in wids:
+                    self.pi.wave_delete(wid)
+
+    @staticmethod
+    def _ramp_plan(total_steps: int, fmin: int, fmax: int):
+        """
+        (freq_hz, steps) per segment of a move, with the steps summing to
+        total_steps exactly. Each segment's frequency is the ramp evaluated at
+        its midpoint, so the profile is a function of position, not of time.
+        """
+        n = min(total_steps, RAMP_SEGMENTS)
+        plan = []
+        prev = 0
+        for i in range(1, n + 1):
+            edge = (i * total_steps) // n
+            k = s_curve_01(trapezoid_fraction((prev + edge) / 2.0, total_steps))
+            plan.append((max(1, int(round(fmin + (fmax - fmin) * k))), edge - prev))
+            prev = edge
+        return plan
 
     def move_to(self, absolute_steps: int) -> None:
         with self._lock: self._target_steps = int(absolute_steps)
+        self._wake.set()
 
     def get_position(self) -> int:
         with self._lock: return int(self._pos_steps)
@@ -146,58 +247,62 @@ class Axis:
     # =========================================================================
     def _move_block(self, total_steps: int, forward: bool) -> None:
         if total_steps <= 0: return
-        self._set_dir(forward)
-        self._set_enable(True)
 
         fmin = int(FREQ_MIN_HZ * self._speed_scale)
         fmax = int(FREQ_MAX_HZ * self._speed_scale)
         fmin = max(fmin, 1)
         fmax = max(fmax, fmin)
 
-        self._hardware_pwm(fmin)
-        steps_done_in_ramp = 0.0
-        steps_done_in_finish = 0
-        t_prev = time.perf_counter()
-        final_freq = fmin
+        # All but the last segment run on hardware PWM for steps/freq seconds
+        # each; the last goes out as an exact pulse wave so the move ends on a
+        # whole pulse rather than wherever the PWM is cut
+        plan = self._ramp_plan(total_steps, fmin, fmax)
+        final_freq, final_steps = plan.pop()
+        steps_moved = 0
+        if plan:
+            self._start_motion(forward, plan[0][0])
+        else:
+            self._set_dir_and_enable(forward)
 
         try:
-            # Main ramp loop. Position is NOT updated here to avoid jitter.
-            while steps_done_in_ramp < total_steps and not self._stop_evt.is_set():
-                u = trapezoid_fraction(steps_done_in_ramp, total_steps)
-                k = s_curve_01(u)
-                final_freq = int(round(fmin + (fmax - fmin) * k))
-                # Ensure frequency is at least 1 to avoid PWM issues
-                if final_freq < 1: final_freq = 1
-                self._hardware_pwm(final_freq)
-
-                time.sleep(RAMP_UPDATE_S)
-                t_now = time.perf_counter()
-                dt = t_now - t_prev
-                t_prev = t_now
-                steps_done_in_ramp += final_freq * dt
-
-            # Stop the PWM before emitting the final precise pulses
-            self._hardware_pwm(0)
-
-            # Calculate remaining pulses to perfectly match the target
-            remaining = int(round(total_steps - steps_done_in_ramp))
-
-            if remaining > 0 and not self._stop_evt.is_set():
-                # FIXED: Use the last frequency of the ramp for a smooth, jerk-free transition
-                self._emit_exact_pulses(remaining, final_freq)
-                steps_done_in_finish = remaining
+            # Deadlines are absolute, so sleep overshoot moves a segment
+            # boundary a little but doesn't accumulate over the move
+            deadline = time.perf_counter()
+            for i, (freq, steps) in enumerate(plan):
+                if i: self._hardware_pwm(freq)  # _start_motion started the first
+                deadline += steps / freq
+                remaining_s = deadline - time.perf_counter()
+                if remaining_s > 0:
+                    time.sleep(remaining_s)
+                steps_moved += steps
+                if self._stop_evt.is_set():
+                    break
+
+            if not self._stop_evt.is_set():
+                got_wave = _WAVE_LOCK.acquire(blocking=False)
+                if not got_wave:
+                    # The other axis is sending its wave: step on PWM at the final
+                    # frequency until it's done, then send only what's left
+                    self._hardware_pwm(final_freq)
+                    t_wait = time.perf_counter()
+                    got_wave = _WAVE_LOCK.acquire(timeout=final_steps / final_freq)
+                    self._hardware_pwm(0)
+                    sent = min(final_steps, round((time.perf_counter() - t_wait) * final_freq))
+                    steps_moved += sent
+                    final_steps -= sent
+                # Stop the PWM before emitting the final precise pulses
+                self._hardware_pwm(0)
+                if got_wave:
+                    try:
+                        steps_moved += self._emit_exact_pulses(final_steps, final_freq)
+                    finally:
+                        _WAVE_LOCK.release()
 
         finally:
             self._hardware_pwm(0)
-            # FIXED: Update the official position once, after the move is complete.
-            # This is more accurate and correctly handles interruptions by _stop_evt.
-            actual_steps_moved = int(round(steps_done_in_ramp)) + steps_done_in_finish
-
-            # Clamp the result to avoid overshooting due to rounding.
-            actual_steps_moved = min(actual_steps_moved, total_steps)
-
+            # Update the official position once, after the move is complete
             with self._lock:
-                self._pos_steps += actual_steps_moved if forward else -actual_steps_moved
+                self._pos_steps += steps_moved if forward else -steps_moved
                 self._last_motion_t = time.time()
 
     def _run(self) -> None:
@@ -208,15 +313,24 @@ class Axis:
                 steps, fwd = abs(int(delta)), delta > 0
                 self._move_block(steps, fwd)
             else:
+                # Sleep until move_to()/stop(), or until the driver is due to be disabled
+                timeout = None
                 if not HOLD_ENABLE_WHEN_IDLE:
-                    if (time.time() - self._last_motion_t) > IDLE_DISABLE_AFTER_S:
+                    idle_s = time.time() - self._last_motion_t
+                    if idle_s > IDLE_DISABLE_AFTER_S:
                         self._set_enable(False)
-                time.sleep(IDLE_SLEEP_S)
+                    else:
+                        timeout = IDLE_DISABLE_AFTER_S - idle_s
+                self._wake.wait(timeout)
+                # The target is stored before the event is set, so the next
+                # delta read sees anything that arrived before this clear
+                self._wake.clear()
         self._hardware_pwm(0)
         if not HOLD_ENABLE_WHEN_IDLE: self._set_enable(False)
 
     def stop(self):
         self._stop_evt.set()
+        self._wake.set()
 
 
 class Controller:
@@ -246,6 +360,17 @@ class Controller:
         # Send tilt steps to the axis currently wired as the "pan" motor
         self._x.move_to(steps)
 
+    def move(self, pan: Optional[float] = None, tilt: Optional[float] = None) -> None:
+        """Sets pan and tilt as one update; either may be None to leave it as is."""
+        pan_steps = None if pan is None else int(round(clamp(pan, PAN_MIN_DEG, PAN_MAX_DEG) * STEPS_PER_DEG_PAN))
+        tilt_steps = None if tilt is None else int(round(clamp(tilt, TILT_MIN_DEG, TILT_MAX_DEG) * STEPS_PER_DEG_TILT))
+        # Hold both axis locks so neither worker sees one target without the other
+        with self._y._lock, self._x._lock:
+            if pan_steps is not None:
+                self._y.move_to(pan_steps)
+            if tilt_steps is not None:
+                self._x.move_to(tilt_steps)
+
     def get_pan_tilt(self) -> Tuple[float, float]:
         # Report physical pan from the axis driven by pan(), and tilt from the other
         x_deg = self._y.get_position() / STEPS_PER_DEG_PAN
@@ -271,6 +396,8 @@ class Controller:
                 # Ensure motors are disabled
                 self._x._set_enable(False)
                 self._y._set_enable(False)
+                self._x._delete_scripts(self._x._start_sids)
+                self._y._delete_scripts(self._y._start_sids)
                 self.pi.stop()
 
 
@@ -13,12 +13,17 @@ an internal target.
 
 Select this backend by setting env var STEPPER_BACKEND=rpimotorlib before
 starting the app. main.py will import this module when that var is set.
+
+For steadier step timing, set STEP_CPU=3 as well and isolate that core on the
+kernel command line (isolcpus=3 nohz_full=3 rcu_nocbs=3). Each axis thread then
+pins itself to it and, when run as root, switches to SCHED_FIFO.
 """
 from __future__ import annotations
 import atexit
+import os
 import threading
 import time
-from typing import Tuple
+from typing import Optional, Tuple
 
 try:
     from RpiMotorLib import RpiMotorLib  # RpiMotorLib provides A4988Nema class
@@ -36,6 +41,8 @@ except Exception:
 ACTIVE_HIGH_ENABLE = True
 HOLD_ENABLE_WHEN_IDLE = True
 IDLE_DISABLE_AFTER_S = 1.5
+IDLE_DISABLE_AFTER_NS = int(IDLE_DISABLE_AFTER_S * 1e9)
+SHUTDOWN_TIMEOUT_S = 2.0  # longest shutdown() waits for the axes to reach 0
 
 # HAT pinout (BCM) – same as other backends
 M1_DIR, M1_STEP, M1_EN = 13, 19, 12  # X / pan (wired on board)
@@ -47,6 +54,8 @@ M2_MODE = (21, 22, 27)
 # Microstepping mode supported by RpiMotorLib steptype strings
 # Valid: 'Full','Half','1/4','1/8','1/16','1/32'
 MICROSTEP = '1/16'
+# motor_go steptype string for MICROSTEP, worked out once
+_STEPTYPE = MICROSTEP.capitalize() if MICROSTEP.lower() == 'full' else MICROSTEP
 
 # ===== conversion pan/tilt <-> steps =====
 # Keep consistent feel with the pigpio backend defaults
@@ -63,11 +72,25 @@ TILT_MAX_DEG = PAN_MAX_DEG
 MAX_STEP_HZ = 800     # maximum step rate (Hz)
 MIN_STEP_HZ = 100     # start/low speed (Hz)
 ACCEL_SPS2 = 1500     # crude accel used to ramp step rate in the thread
-IDLE_SLEEP_S = 0.01
+CHUNK_TIME_S = 0.025  # length of one motor_go call; new targets are only seen between calls
+
+# Real-time tuning for the axis threads (see module docstring); unset = off
+STEP_CPU = os.getenv("STEP_CPU")
+STEP_RT_PRIORITY = 80
+
 
+_GPIO_INITIALIZED = False
 
-def clamp(v: float, lo: float, hi: float) -> float:
-    return lo if v < lo else hi if v > hi else v
+
+def _ensure_gpio(pins: Tuple[int, ...]) -> None:
+    # Numbering mode and warnings are global to RPi.GPIO: set them for the first axis only
+    global _GPIO_INITIALIZED
+    if not _GPIO_INITIALIZED:
+        GPIO.setmode(GPIO.BCM)
+        GPIO.setwarnings(False)
+        _GPIO_INITIALIZED = True
+    # RPi.GPIO takes a pin list: one call instead of one per pin
+    GPIO.setup(list(pins), GPIO.OUT, initial=GPIO.LOW)
 
 
 class Axis(threading.Thread):
@@ -77,17 +100,18 @@ class Axis(threading.Thread):
         self.dir_pin, self.step_pin, self.en_pin = dir_pin, step_pin, en_pin
         self.mode_pins = mode_pins
         self.steps_per_deg = steps_per_deg
+        # No lock: move_to() only stores _target_steps and only the worker writes
+        # _pos_steps, and single attribute reads/writes are atomic under the GIL
         self._target_steps = 0
         self._pos_steps = 0
-        self._last_motion_t = 0.0
+        self._last_motion_t = 0  # time.monotonic_ns() at the end of the last chunk
+        self._enabled: Optional[bool] = None  # last level written to EN; None forces the first write
         self._stop_evt = threading.Event()
-        self._lock = threading.RLock()
+        self._wake = threading.Event()  # set by move_to()/stop(); the idle worker waits on it
+        self._idle_evt = threading.Event()  # set by the worker each time it goes idle
 
         if _HAS_RPIMOTOR:
-            GPIO.setmode(GPIO.BCM)
-            GPIO.setwarnings(False)
-            for p in (dir_pin, step_pin, en_pin, *mode_pins):
-                GPIO.setup(p, GPIO.OUT, initial=GPIO.LOW)
+            _ensure_gpio((dir_pin, step_pin, en_pin, *mode_pins))
             # MODE pins: RpiMotorLib will toggle them per step type, but safe to preset
             # We'll let motor_go steptype handle microstep selection; mode pins may be -1 to ignore.
             # Keep them as usable pins so the library can set them if required.
@@ -102,21 +126,37 @@ class Axis(threading.Thread):
         self.start()
 
     def _set_enable(self, enable: bool) -> None:
-        if not _HAS_RPIMOTOR:
+        # run() asks for enable before every chunk; only touch the pin on a change
+        if not _HAS_RPIMOTOR or enable == self._enabled:
             return
         level = GPIO.HIGH if (enable == ACTIVE_HIGH_ENABLE) else GPIO.LOW
         GPIO.output(self.en_pin, level)
+        self._enabled = enable
 
     def move_to(self, absolute_steps: int) -> None:
-        with self._lock:
-            self._target_steps = int(absolute_steps)
+        self._target_steps = int(absolute_steps)
+        self._wake.set()
 
     def get_position(self) -> int:
-        with self._lock:
-            return int(self._pos_steps)
+        return self._pos_steps
+
+    def wait_idle(self, timeout: float) -> bool:
+        """Waits until the axis is at its target; returns False on timeout."""
+        deadline = time.monotonic() + timeout
+        while self._pos_steps != self._target_steps:
+            # Clear first, then re-check: a set from a finished move can't be
+            # lost, and one left over from before the last move_to() is dropped
+            self._idle_evt.clear()
+            if self._pos_steps == self._target_steps:
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self._idle_evt.wait(remaining):
+                return False
+        return True
 
     def stop(self) -> None:
         self._stop_evt.set()
+        self._wake.set()
         if _HAS_RPIMOTOR:
             self._set_enable(False)
 
@@ -126,11 +166,9 @@ class Axis(threading.Thread):
         if _HAS_RPIMOTOR and self._motor is not None:
             step_hz = max(1.0, min(MAX_STEP_HZ, step_hz))
             delay = 1.0 / step_hz
-            # Use the configured microstep mode as steptype string
-            steptype = MICROSTEP.capitalize() if MICROSTEP.lower() == 'full' else MICROSTEP
             try:
                 # motor_go is blocking; run small chunks to remain responsive
-                self._motor.motor_go(clockwise, steptype, steps, delay, False, 0.0)
+                self._motor.motor_go(clockwise, _STEPTYPE, steps, delay, False, 0.0)
             except Exception:
                 # Fail quietly on dev machines without real hardware
                 time.sleep(delay * steps)
@@ -138,11 +176,25 @@ class Axis(threading.Thread):
             # Dev fallback: just sleep to simulate motion duration
             time.sleep(steps / max(1.0, step_hz))
 
+    def _apply_rt_tuning(self) -> None:
+        # pid 0 is the calling thread, so this only affects this axis's worker
+        if STEP_CPU is None:
+            return
+        try:
+            os.sched_setaffinity(0, {int(STEP_CPU)})
+        except (OSError, ValueError) as e:
+            print(f"[{self.name}] could not pin to CPU {STEP_CPU}: {e}")
+        try:
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(STEP_RT_PRIORITY))
+        except OSError as e:
+            # Needs root or CAP_SYS_NICE; keep running at normal priority
+            print(f"[{self.name}] SCHED_FIFO not available: {e}")
+
     def run(self) -> None:
+        self._apply_rt_tuning()
         cur_hz = MIN_STEP_HZ
         while not self._stop_evt.is_set():
-            with self._lock:
-                delta = self._target_steps - self._pos_steps
+            delta = self._target_steps - self._pos_steps
             if delta != 0:
                 # Enable coils while moving
                 self._set_enable(True)
@@ -154,20 +206,29 @@ class Axis(threading.Thread):
                     cur_hz = min(target_hz, cur_hz + ACCEL_SPS2 * 0.002)
                 elif cur_hz > target_hz:
                     cur_hz = max(MIN_STEP_HZ, cur_hz - ACCEL_SPS2 * 0.002)
-                cur_hz = clamp(cur_hz, MIN_STEP_HZ, MAX_STEP_HZ)
+                # No clamp needed: target_hz is within [MIN_STEP_HZ, MAX_STEP_HZ] and
+                # both branches above stop at target_hz or MIN_STEP_HZ
 
-                # Step in small chunks to stay responsive to target updates
-                chunk = min(200, abs(delta))
+                # Step in short chunks to stay responsive to target updates:
+                # sized by time, so slow moves don't lock out new targets for longer
+                chunk = max(1, min(int(cur_hz * CHUNK_TIME_S), abs(delta)))
                 self._step_chunk(chunk, clockwise=(direction > 0), step_hz=cur_hz)
-                with self._lock:
-                    self._pos_steps += direction * chunk
-                self._last_motion_t = time.time()
+                self._pos_steps += direction * chunk
+                self._last_motion_t = time.monotonic_ns()
             else:
-                # Idle: optionally disable
+                self._idle_evt.set()
+                # Sleep until move_to()/stop(), or until the driver is due to be disabled
+                timeout = None
                 if not HOLD_ENABLE_WHEN_IDLE:
-                    if (time.time() - self._last_motion_t) > IDLE_DISABLE_AFTER_S:
+                    idle_ns = time.monotonic_ns() - self._last_motion_t
+                    if idle_ns > IDLE_DISABLE_AFTER_NS:
                         self._set_enable(False)
-                time.sleep(IDLE_SLEEP_S)
+                    else:
+                        timeout = (IDLE_DISABLE_AFTER_NS - idle_ns) / 1e9
+                self._wake.wait(timeout)
+                # The target is stored before the event is set, so the next
+                # delta read sees anything that arrived before this clear
+                self._wake.clear()
 
 
 class Controller:
@@ -179,17 +240,27 @@ class Controller:
 
     # Match pigpio backend mapping and limits
     def pan(self, degrees: float) -> None:
-        deg = clamp(degrees, PAN_MIN_DEG, PAN_MAX_DEG)
+        deg = max(PAN_MIN_DEG, min(PAN_MAX_DEG, degrees))
         steps = int(round(deg * STEPS_PER_DEG_PAN))
         # Send pan to Y axis to preserve current wiring mapping
         self._y.move_to(steps)
 
     def tilt(self, degrees: float) -> None:
-        deg = clamp(degrees, TILT_MIN_DEG, TILT_MAX_DEG)
+        deg = max(TILT_MIN_DEG, min(TILT_MAX_DEG, degrees))
         steps = int(round(deg * STEPS_PER_DEG_TILT))
         # Send tilt to X axis to preserve current wiring mapping
         self._x.move_to(steps)
 
+    def move(self, pan: Optional[float] = None, tilt: Optional[float] = None) -> None:
+        """Sets pan and tilt as one update; either may be None to leave it as is."""
+        pan_steps = None if pan is None else int(round(max(PAN_MIN_DEG, min(PAN_MAX_DEG, pan)) * STEPS_PER_DEG_PAN))
+        tilt_steps = None if tilt is None else int(round(max(TILT_MIN_DEG, min(TILT_MAX_DEG, tilt)) * STEPS_PER_DEG_TILT))
+        # Both targets are converted before either is stored, so they land back to back
+        if pan_steps is not None:
+            self._y.move_to(pan_steps)
+        if tilt_steps is not None:
+            self._x.move_to(tilt_steps)
+
     def get_pan_tilt(self) -> Tuple[float, float]:
         x_deg = self._y.get_position() / STEPS_PER_DEG_PAN
         y_deg = self._x.get_position() / STEPS_PER_DEG_TILT
@@ -201,7 +272,10 @@ class Controller:
     def shutdown(self) -> None:
         try:
             self.pan(0); self.tilt(0)
-            time.sleep(1.0)
+            # Return as soon as both axes are home rather than after a fixed sleep
+            deadline = time.monotonic() + SHUTDOWN_TIMEOUT_S
+            self._x.wait_idle(SHUTDOWN_TIMEOUT_S)
+            self._y.wait_idle(max(0.0, deadline - time.monotonic()))
             self.stop()
         finally:
             if _HAS_RPIMOTOR: